@@ -0,0 +1,256 @@
+# File name: Benchmark.py
+# Programmer: Sebastien Marleau
+# Description: measures the cost of building, hit-testing and drawing grids as puzzles grow
+#              runs without a window (SDL_VIDEODRIVER=dummy) and draws to an off-screen Surface
+#              results are written as json and compared against a stored baseline to catch slowdowns
+#   python Benchmark.py                                  run everything, write bench_results.json
+#   python Benchmark.py --sizes 10,50 --words 5,100      a smaller sweep
+#   python Benchmark.py --save-baseline                  also store the results as the baseline
+#   python Benchmark.py --baseline bench_baseline.json   exits with 1 when something got slower than allowed
+#   python Benchmark.py --filter boardMemory              the memory a 250x250 board keeps, Buttons vs compact cells
+# timings only compare on the machine they were taken on, so no baseline comes with the game: store one with
+# --save-baseline on the machine the checks run on, before the change being checked
+# Date: October 17th, 2026
+
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import argparse
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+import pygame
+pygame.init()
+from Grid import *
+from LetterMatrix import LetterMatrix
+
+DEFAULT_SIZES = (10, 25, 50, 100, 250, 500)
+DEFAULT_WORD_COUNTS = (5, 50, 200, 1000)
+CELL_SIZE = 20
+HOVER_POSITIONS = 1000
+MEMORY_BOARD_SIZE = 250
+
+
+def randomLetters(rng, count):
+    return [rng.choice("ABCDEFGHIJKLMNOPQRSTUVWXYZ") for cell in range(count)]
+
+
+def randomWords(rng, count):
+    return ["".join(randomLetters(rng, rng.randint(4, 10))) for word in range(count)]
+
+
+def makeWordSearch(letters, size, words, compactCells=True):
+    rect = pygame.Rect(0, 0, size * CELL_SIZE, size * CELL_SIZE)
+    return WordSearchGrid(rect, size, size, CELL_SIZE, CELL_SIZE, letters, words, [], (230, 230, 230),
+                          font=Fonts.get("arial", CELL_SIZE // 2), compactCells=compactCells)
+
+
+def makeMatrixWordSearch(letters, size, words):
+    rect = pygame.Rect(0, 0, size * CELL_SIZE, size * CELL_SIZE)
+    return MatrixWordSearchGrid(rect, size, size, CELL_SIZE, CELL_SIZE, LetterMatrix.fromLetters(size, size, letters),
+                                words, [], (230, 230, 230), font=Fonts.get("arial", CELL_SIZE // 2))
+
+
+def makeButtonGrid(size):
+    rect = pygame.Rect(0, 0, size * CELL_SIZE, size * CELL_SIZE)
+    return ButtonGrid(rect, [], size, size, CELL_SIZE, CELL_SIZE, buttonsDarkenOnHover=True,
+                      boxBackgroundColor=(200, 200, 200), fillBoxesWithColor=True)
+
+
+class Benchmark:
+    # one measured operation: setup() builds what it needs and returns the function to time
+    def __init__(self, name, setup, repeat=3):
+        self.name = name
+        self.setup = setup
+        self.repeat = repeat
+
+    def run(self):
+        # best time of a few runs, then one more run with tracemalloc for the allocations
+        # allocatedBytes is what is still allocated while the function's result is kept, the memory a grid holds
+        # when the function builds one
+        seconds = None
+        for attempt in range(self.repeat):
+            function = self.setup()
+            start = time.perf_counter()
+            function()
+            elapsed = time.perf_counter() - start
+            seconds = elapsed if seconds is None else min(seconds, elapsed)
+
+        function = self.setup()
+        tracemalloc.start()
+        result = function()
+        allocated, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        return {"seconds": seconds, "allocatedBytes": allocated, "peakBytes": peak}
+
+
+def buildBenchmarks(sizes, wordCounts, seed=0):
+    benchmarks = []
+    for size in sizes:
+        rng = random.Random(seed)
+        letters = randomLetters(rng, size * size)
+        words = randomWords(rng, 5)
+        positions = [(rng.randrange(size * CELL_SIZE), rng.randrange(size * CELL_SIZE))
+                     for position in range(HOVER_POSITIONS)]
+
+        def initCells(letters=letters, size=size, words=words):
+            return lambda: makeWordSearch(letters, size, words)
+
+        def hoverOver(size=size, positions=positions):
+            grid = makeButtonGrid(size)
+            return lambda: [grid.hoverOver(mp) for mp in positions]
+
+        def updateSelectedSquares(letters=letters, size=size, words=words):
+            grid = makeWordSearch(letters, size, words)
+            grid.session.startSelection((0, 0))
+            # dragging along the first row, the first column and the diagonal
+            ends = [(0, ind) for ind in range(size)] + [(ind, 0) for ind in range(size)] + [(ind, ind) for ind in range(size)]
+
+            def select():
+                for end in ends:
+                    grid.session.lastSelecSquare = end
+                    grid.updateSelectedSquares()
+                    grid.getPossibleWordsFromSelectedSquares()
+            return select
+
+        def draw(letters=letters, size=size, words=words):
+            # made here, only one size's surface is alive at a time: a 500x500 one takes 400MB
+            surface = pygame.Surface((size * CELL_SIZE, size * CELL_SIZE))
+            grid = makeWordSearch(letters, size, words)
+            grid.draw(surface)  # the first draw renders what later frames reuse
+            return lambda: grid.draw(surface)
+
+        benchmarks += [Benchmark("initCells/%dx%d" % (size, size), initCells),
+                       Benchmark("hoverOver/%dx%d/%d" % (size, size, HOVER_POSITIONS), hoverOver),
+                       Benchmark("updateSelectedSquares/%dx%d" % (size, size), updateSelectedSquares),
+                       Benchmark("draw/%dx%d" % (size, size), draw)]
+
+        if LetterMatrix.isAvailable():
+            def matrixInit(letters=letters, size=size, words=words):
+                return lambda: makeMatrixWordSearch(letters, size, words)
+
+            def matrixDraw(letters=letters, size=size, words=words):
+                surface = pygame.Surface((size * CELL_SIZE, size * CELL_SIZE))
+                grid = makeMatrixWordSearch(letters, size, words)
+                grid.draw(surface)
+                return lambda: grid.draw(surface)
+
+            benchmarks += [Benchmark("matrixInit/%dx%d" % (size, size), matrixInit),
+                           Benchmark("matrixDraw/%dx%d" % (size, size), matrixDraw)]
+
+    # the memory of one large board, with a Button per letter and with compact cells sharing one style
+    rng = random.Random(seed)
+    letters = randomLetters(rng, MEMORY_BOARD_SIZE * MEMORY_BOARD_SIZE)
+    words = randomWords(rng, 5)
+    for compactCells, cellKind in ((False, "buttons"), (True, "compact")):
+        def boardMemory(letters=letters, words=words, compactCells=compactCells):
+            return lambda: makeWordSearch(letters, MEMORY_BOARD_SIZE, words, compactCells)
+
+        benchmarks.append(Benchmark("boardMemory/%dx%d/%s" % (MEMORY_BOARD_SIZE, MEMORY_BOARD_SIZE, cellKind),
+                                    boardMemory, repeat=1))
+
+    size = 50  # word list costs are measured on one grid size
+    for wordCount in wordCounts:
+        rng = random.Random(seed)
+        letters = randomLetters(rng, size * size)
+        words = randomWords(rng, wordCount)
+
+        def validateSelection(letters=letters, words=words):
+            grid = makeWordSearch(letters, size, words)
+            first = grid.cellList[0][0].rect.center
+            last = grid.cellList[0][size - 1].rect.center
+
+            def select():
+                for attempt in range(100):
+                    grid.clickedOn(first)
+                    grid.hoverOver(last)
+                    grid.clickedOn(last)
+            return select
+
+        def crossOutGrid(words=words):
+            rect = pygame.Rect(0, 0, 200, len(words) * 20)
+            return lambda: CrossOutWordGrid(rect, words, 1, len(words), 200, 20, centerY=False)
+
+        def crossOut(words=words):
+            # a word found at a time, syncing the word list after each
+            grid = CrossOutWordGrid(pygame.Rect(0, 0, 200, len(words) * 20), words, 1, len(words), 200, 20,
+                                    centerY=False)
+
+            def findAll():
+                found = []
+                for word in words:
+                    found.append(word)
+                    grid.crossOut(found)
+            return findAll
+
+        benchmarks += [Benchmark("validateSelection/%dx%d/%dwords" % (size, size, wordCount), validateSelection),
+                       Benchmark("crossOutGrid/%dwords" % wordCount, crossOutGrid),
+                       Benchmark("crossOut/%dwords" % wordCount, crossOut)]
+    return benchmarks
+
+
+def compareWithBaseline(results, baseline, threshold, minSeconds=0.001):
+    # returns the names of the benchmarks that got slower than threshold times their baseline
+    # benchmarks faster than minSeconds in the baseline are too noisy to compare and only get their ratio
+    regressions = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if old is None or old["seconds"] <= 0:
+            continue
+        ratio = result["seconds"] / old["seconds"]
+        result["baselineRatio"] = ratio
+        if ratio > threshold and old["seconds"] >= minSeconds:
+            regressions.append(name)
+    return regressions
+
+
+def parseNumbers(text):
+    return [int(number) for number in text.split(",") if number]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless grid benchmarks.")
+    parser.add_argument("--sizes", type=parseNumbers, default=list(DEFAULT_SIZES), help="grid sizes, eg. 10,50,100")
+    parser.add_argument("--words", type=parseNumbers, default=list(DEFAULT_WORD_COUNTS), help="word counts")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--baseline", default="bench_baseline.json")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=1.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    results = dict()
+    for benchmark in buildBenchmarks(args.sizes, args.words):
+        if args.filter not in benchmark.name:
+            continue
+        results[benchmark.name] = benchmark.run()
+        print("%-45s %10.2f ms %12d bytes %12d kept" % (benchmark.name, results[benchmark.name]["seconds"] * 1000,
+                                                        results[benchmark.name]["peakBytes"],
+                                                        results[benchmark.name]["allocatedBytes"]))
+
+    regressions = []
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline) as fi:
+            regressions = compareWithBaseline(results, json.load(fi)["results"], args.threshold)
+        for name in regressions:
+            print("slower than the baseline: %s (%.2fx)" % (name, results[name]["baselineRatio"]))
+    elif not args.save_baseline:
+        print("no baseline at %s, nothing was compared, store one with --save-baseline" % args.baseline)
+
+    report = {"python": platform.python_version(), "pygame": pygame.version.ver, "platform": platform.platform(),
+              "time": time.strftime("%Y-%m-%dT%H:%M:%S"), "results": results}
+    with open(args.output, 'w') as fo:
+        json.dump(report, fo, indent=1)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as fo:
+            json.dump(report, fo, indent=1)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
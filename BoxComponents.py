@@ -3,22 +3,30 @@
 # Contains:
 #       class WordBox: contains a rect and text that can center in the rect. Many attribute changes
 #       class Button: extends WordBox and adds features such as clicking and hovering
+#       class BoxStyle: the look of a box, immutable and shared by every cell of a grid
+#       class CompactWordBox: a WordBox for grids of many cells, its look is a shared BoxStyle
+#       class CompactButton: extends CompactWordBox with Button's clicking and hovering
 # Date: April 9th, 2019
 
 
 import pygame
 from Colors import *
+from TextCache import textCache
+from Fonts import Fonts
 
 
 class WordBox:
     # a class containing both a drawable box and text optionally centered in the box
     # the border color, width, background color are all changeable
     # has a drawList for improved efficiency and flexibility
+    # reports the areas it changed in dirtyRects so a DirtyRenderer only redraws those
     # coded with robustness in mind
-    def __init__(self, rect, text='', font=pygame.font.SysFont("arial", 12), centerTextInBox=True,
+    def __init__(self, rect, text='', font=Fonts.get("arial", 12), centerTextInBox=True,
                  textColor=Colors.BLACK, drawText=True, borderColor=Colors.BLACK, drawBorder=True,
                  borderWidth=1, boxBackgroundColor=None, fillBoxWithColor=False, visible=True):
 
+        # areas that changed since the last popDirtyRects(), grids replace it with a list shared by all their cells
+        self.dirtyRects = []
         self._visible = visible
         self.rect = rect
 
@@ -38,7 +46,8 @@ class WordBox:
         self._text = text
         self._font = font
         self.textPosition = 0  # initialized in _updateTextPosition()
-        self.textBlit = None  # initialized in _updateTextBlit()
+        self.textBlit = None  # initialized in _updateTextBlit(), shared through textCache so never draw on it
+        self._textSize = (0, 0)  # initialized in _updateTextBlit()
         self._updateTextBlit()
         self._updateTextPosition()
 
@@ -51,8 +60,26 @@ class WordBox:
     def getBackgroundColor(self):
         return self._boxBackgroundColor
 
+    def getTextColor(self):
+        return self._textColor
+
+    def getBounds(self):  # the area drawing can touch, text is allowed to stick out of the box
+        if not self._drawText:
+            return self.rect
+        return self.rect.union(self.textBlit.get_rect(topleft=self.textPosition))
+
+    # dirty areas
+
+    def markDirty(self):
+        self.dirtyRects.append(self.getBounds())
+
+    def popDirtyRects(self):
+        rects = self.dirtyRects[:]
+        del self.dirtyRects[:]  # cleared in place since grids share the list
+        return rects
+
     def _getCenteredTextPosition(self):
-        pos = self._font.size(self._text)
+        pos = self._textSize
         x = self.rect.left + self.rect.width / 2 - pos[0] / 2
         y = self.rect.top + self.rect.height / 2 - pos[1] / 2
         return x, y
@@ -71,30 +98,55 @@ class WordBox:
     # updating functions, also updating related things
 
     def updateBackgroundColor(self, color):
-        self._boxBackgroundColor = color
+        if color != self._boxBackgroundColor:
+            self._boxBackgroundColor = color
+            self.markDirty()
 
     def updateText(self, text):
+        if text == self._text:
+            return
+        self.markDirty()  # old text area
         self._text = text
         self._updateTextBlit()
         self._updateTextPosition()
+        self.markDirty()
 
     def updateTextColor(self, color):
+        if color == self._textColor:
+            return
         self._textColor = color
         self._updateTextBlit()
+        self.markDirty()
 
     def updateTextFont(self, font):
+        if font is self._font:
+            return
+        self.markDirty()  # old text area
         self._font = font
         self._updateTextBlit()
         self._updateTextPosition()
+        self.markDirty()
 
     def updateBorderColor(self, color):
-        self._borderColor = color
+        if color != self._borderColor:
+            self._borderColor = color
+            self.markDirty()
 
     def updateBorderWidth(self, width):
-        self._borderWidth = width
+        if width != self._borderWidth:
+            self._borderWidth = width
+            self.markDirty()
+
+    def updatePosition(self, left, top):  # moves the box and its text, keeping the size
+        if (left, top) == self.rect.topleft:
+            return
+        self.markDirty()  # old area
+        self.rect.topleft = (left, top)
+        self._updateTextPosition()
+        self.markDirty()
 
     def _updateTextBlit(self):
-        self.textBlit = self._font.render(self._text, True, self._textColor)
+        self.textBlit, self._textSize = textCache.render(self._font, self._text, self._textColor)
 
     def _updateTextPosition(self):
         if self._centerTextInBox:
@@ -107,37 +159,49 @@ class WordBox:
     def startDrawingBoxBackground(self):
         self._fillBoxWithColor = True
         self.updateDrawList()
+        self.markDirty()
     def stopDrawingBoxBackground(self):
         self._fillBoxWithColor = False
         self.drawList.remove(self.drawTheBoxBackground)
+        self.markDirty()
 
     def startDrawingText(self):
         self._drawText = True
         self.updateDrawList()
+        self.markDirty()
     def stopDrawingText(self):
+        self.markDirty()  # while the text is still part of the bounds
         self._drawText = False
         self.drawList.remove(self.drawTheText)
 
     def startCenteringText(self):
+        self.markDirty()
         self._centerTextInBox = True
         self._updateTextPosition()
+        self.markDirty()
     def stopCenteringText(self):
+        self.markDirty()
         self._centerTextInBox = False
         self._updateTextPosition()
+        self.markDirty()
 
     def startDrawingBorder(self):
         self._drawBorder = True
         self.updateDrawList()
+        self.markDirty()
     def stopDrawingBorder(self):
         self._drawBorder = False
         self.drawList.remove(self.drawTheBorder)
+        self.markDirty()
 
     def makeVisible(self):
         self._visible = True
         self.updateDrawList()
+        self.markDirty()
     def makeInvisible(self):
         self._visible = False
         self.updateDrawList()
+        self.markDirty()
 
     # updates drawList functions based on attributes
     def updateDrawList(self):
@@ -155,6 +219,9 @@ class WordBox:
         for drawFunction in self.drawList:
             drawFunction(win)
 
+    def drawArea(self, win, area):  # used by DirtyRenderer, a box is small enough to redraw whole
+        self.draw(win)
+
 
 ########################################################################################################################
 ########################################################################################################################
@@ -163,7 +230,9 @@ class WordBox:
 class Button(WordBox):
     # class containing a word box with different features on hover
     # can also executes a function when clicked
-    def __init__(self, rect, functionIfClicked=lambda: None, text='', font=pygame.font.SysFont("arial", 12),
+    # the hover look is put on and taken off by hoverOver() when the mouse enters or leaves, drawing does no hover
+    # work. Both colors of the text are rendered with the text, hovering only swaps them
+    def __init__(self, rect, functionIfClicked=lambda: None, text='', font=Fonts.get("arial", 12),
                  textColor=Colors.BLACK, drawText=True, borderColor=Colors.BLACK, drawBorder=True,
                  borderWidth=1, centerTextInBox=True, borderGrowOnHover=True, growColor=Colors.BLACK,
                  growWidth=3, darkenOnHover=True, boxBackgroundColor=None, fillBoxWithColor=False,
@@ -188,7 +257,9 @@ class Button(WordBox):
         self._textColorChangeColor = textColorChangeColor
 
         self.__hovers = False
-        self.hoverCheckList = list()
+        self.hoverCheckList = list()  # puts on the look of the current hover state, run when that state changes
+        self._plainText = None  # (surface, size) of the text, initialized in _updateTextBlit()
+        self._hoverText = None  # (surface, size) of the text while hovered, initialized in _updateTextBlit()
 
         self.functionIfClicked = functionIfClicked
 
@@ -218,17 +289,42 @@ class Button(WordBox):
             super().updateBackgroundColor(self._nonDarkenedBackground)
 
     def _hoverForTextColorChange(self):
-        if self.__hovers:
-            super().updateTextColor(self._textColorChangeColor)
-        else:
-            super().updateTextColor(self._nonChangedTextColor)
+        text = self._hoverText if self.__hovers else self._plainText
+        if text[0] is not self.textBlit:  # same size both ways, the text stays where it is
+            self.textBlit, self._textSize = text
+            self._textColor = self._textColorChangeColor if self.__hovers else self._nonChangedTextColor
+            self.markDirty()
+
+    def _applyHoverLook(self):
+        for check in self.hoverCheckList:
+            check()
 
     # updating functions
 
+    def _updateTextBlit(self):
+        self._plainText = textCache.render(self._font, self._text, self._nonChangedTextColor)
+        if self._textColorChangeOnHover:
+            self._hoverText = textCache.render(self._font, self._text, self._textColorChangeColor)
+        else:
+            self._hoverText = self._plainText
+        hoverLook = self.__hovers and self._textColorChangeOnHover
+        self.textBlit, self._textSize = self._hoverText if hoverLook else self._plainText
+        self._textColor = self._textColorChangeColor if hoverLook else self._nonChangedTextColor
+
+    def updateTextColor(self, color):
+        if color == self._nonChangedTextColor:
+            return
+        self._nonChangedTextColor = color
+        self._updateTextBlit()
+        self.markDirty()
+
     def updateBackgroundColor(self, color):
-        super().updateBackgroundColor(color)
         self._nonDarkenedBackground = color
         self._updateDarkenedColor()
+        if self._darkenOnHover:
+            self._hoverForBackgroundDarken()  # darkened right away when hovered
+        else:
+            super().updateBackgroundColor(color)
 
     def _updateDarkenedColor(self):
         self._darkenedBackgroundColor = Colors.darkenColor(self._nonDarkenedBackground, amount=0.9)
@@ -239,6 +335,10 @@ class Button(WordBox):
         if update != self._borderChangesColor:
             self._borderChangesColor = update
             self.updateHoverCheckList()
+        if self._borderChangesColor:
+            self._hoverForBorderColorChange()
+        else:
+            self.updateBorderColor(self._nonGrowColor)
 
     # updates hover functions list based on attributes
     def updateHoverCheckList(self):
@@ -253,34 +353,36 @@ class Button(WordBox):
         if self._borderChangesColor:
             self.hoverCheckList.append(self._hoverForBorderColorChange)
 
-
-    def draw(self, win):
-        for check in self.hoverCheckList:
-            check()
-        super().draw(win)
-
-    # attribute updates
+    # attribute updates, the look changes right away when the mouse is over the button
 
     def startDarkeningOnHover(self):
         self._darkenOnHover = True
         self.updateHoverCheckList()
+        self._hoverForBackgroundDarken()
     def stopDarkeningOnHover(self):
         self._darkenOnHover = False
         self.hoverCheckList.remove(self._hoverForBackgroundDarken)
+        super().updateBackgroundColor(self._nonDarkenedBackground)
 
     def startBorderGrowOnHover(self):
         self._drawBorderGrow = True
         self.updateHoverCheckList()
+        self._hoverForBorderGrow()
     def stopBorderGrowOnHover(self):
-        self._drawBorderGrow = True
+        self._drawBorderGrow = False
         self.hoverCheckList.remove(self._hoverForBorderGrow)
+        self.updateBorderWidth(self._nonGrowWidth)
 
     def startChangingTextColorOnHover(self):
         self._textColorChangeOnHover = True
         self.updateHoverCheckList()
-    def startChangingTextColorOnHover(self):
+        self._updateTextBlit()
+        self.markDirty()
+    def stopChangingTextColorOnHover(self):
         self._textColorChangeOnHover = False
         self.hoverCheckList.remove(self._hoverForTextColorChange)
+        self._updateTextBlit()
+        self.markDirty()
 
 
     def clickedOn(self, mp):
@@ -294,5 +396,224 @@ class Button(WordBox):
     def hoverOver(self, mp):
         if not self._visible:
             return False
-        self.__hovers = self.rect.collidepoint(mp)
+        hovers = self.rect.collidepoint(mp)
+        if hovers != self.__hovers:
+            self.__hovers = hovers
+            # the mouse entered or left, the only time the look changes
+            self._applyHoverLook()
+            self.markDirty()
         return self.__hovers
+
+
+########################################################################################################################
+########################################################################################################################
+
+
+class BoxStyle:
+    # everything about how a box looks that doesn't change from box to box: colors, border, font, hover behavior
+    # a grid makes one and all its compact cells keep a reference to it, instead of each cell holding its own copies
+    # immutable, so sharing it is safe, a box that needs another look gets another style
+    __slots__ = ("font", "textColor", "centerTextInBox", "drawText", "borderColor", "drawBorder", "borderWidth",
+                 "boxBackgroundColor", "fillBoxWithColor", "darkenOnHover", "darkenedBackgroundColor",
+                 "borderGrowOnHover", "growColor", "growWidth", "textColorChangesOnHover", "textColorChangeColor")
+
+    def __init__(self, font=Fonts.get("arial", 12), textColor=Colors.BLACK, centerTextInBox=True, drawText=True,
+                 borderColor=Colors.BLACK, drawBorder=True, borderWidth=1, boxBackgroundColor=None,
+                 fillBoxWithColor=False, darkenOnHover=False, borderGrowOnHover=False, growColor=Colors.BLACK,
+                 growWidth=3, textColorChangesOnHover=False, textColorChangeColor=Colors.BLACK):
+        values = {"font": font, "textColor": textColor, "centerTextInBox": centerTextInBox, "drawText": drawText,
+                  "borderColor": borderColor, "drawBorder": drawBorder, "borderWidth": borderWidth,
+                  "boxBackgroundColor": boxBackgroundColor, "fillBoxWithColor": fillBoxWithColor,
+                  "darkenOnHover": darkenOnHover, "borderGrowOnHover": borderGrowOnHover, "growColor": growColor,
+                  "growWidth": growWidth, "textColorChangesOnHover": textColorChangesOnHover,
+                  "textColorChangeColor": textColorChangeColor}
+        if darkenOnHover and boxBackgroundColor is not None:
+            values["darkenedBackgroundColor"] = Colors.darkenColor(boxBackgroundColor, amount=0.9)
+        else:
+            values["darkenedBackgroundColor"] = boxBackgroundColor
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("a BoxStyle is shared and can't be changed, make a new one")
+
+
+########################################################################################################################
+########################################################################################################################
+
+
+class CompactWordBox:
+    # the drawing, text and dirty tracking of a WordBox for grids with a box per cell
+    # the look comes from a shared BoxStyle, a box only keeps its rect, text and text surface, and a background
+    # color when it was given one of its own. __slots__ instead of a __dict__ and no lists of bound methods,
+    # so a box is a handful of references and makes no reference cycles
+    __slots__ = ("rect", "style", "dirtyRects", "textBlit", "textPosition", "_text", "_textSize", "_backgroundColor",
+                 "_fillBoxWithColor", "_visible")
+
+    def __init__(self, rect, style, text='', visible=True):
+        self.dirtyRects = []  # grids replace it with a list shared by all their cells
+        self.rect = rect
+        self.style = style
+        self._text = text
+        self._backgroundColor = None  # the style's until updateBackgroundColor()
+        self._fillBoxWithColor = style.fillBoxWithColor
+        self._visible = visible
+        self.textPosition = 0  # initialized in _updateTextPosition()
+        self.textBlit = None  # initialized in _updateTextBlit(), shared through textCache so never draw on it
+        self._textSize = (0, 0)  # initialized in _updateTextBlit()
+        self._updateTextBlit()
+        self._updateTextPosition()
+
+    def getText(self):
+        return self._text
+
+    def getBackgroundColor(self):
+        return self.style.boxBackgroundColor if self._backgroundColor is None else self._backgroundColor
+
+    def getTextColor(self):
+        return self.style.textColor
+
+    def getBounds(self):  # the area drawing can touch, text is allowed to stick out of the box
+        if not self.style.drawText:
+            return self.rect
+        return self.rect.union(self.textBlit.get_rect(topleft=self.textPosition))
+
+    # dirty areas
+
+    def markDirty(self):
+        self.dirtyRects.append(self.getBounds())
+
+    def popDirtyRects(self):
+        rects = self.dirtyRects[:]
+        del self.dirtyRects[:]  # cleared in place since grids share the list
+        return rects
+
+    # draw functions
+
+    def drawTheBorder(self, win):
+        pygame.draw.rect(win, self.style.borderColor, self.rect, self.style.borderWidth)
+
+    def drawTheBoxBackground(self, win):
+        win.fill(self.getBackgroundColor(), rect=self.rect)
+
+    def drawTheText(self, win):
+        win.blit(self.textBlit, self.textPosition)
+
+    def draw(self, win):
+        if not self._visible:
+            return
+        if self._fillBoxWithColor:
+            self.drawTheBoxBackground(win)
+        if self.style.drawBorder:
+            self.drawTheBorder(win)
+        if self.style.drawText:
+            self.drawTheText(win)
+
+    def drawArea(self, win, area):  # used by DirtyRenderer, a box is small enough to redraw whole
+        self.draw(win)
+
+    # updating functions
+
+    def updateBackgroundColor(self, color):
+        if color != self.getBackgroundColor():
+            self._backgroundColor = color
+            self.markDirty()
+
+    def updateText(self, text):
+        if text == self._text:
+            return
+        self.markDirty()  # old text area
+        self._text = text
+        self._updateTextBlit()
+        self._updateTextPosition()
+        self.markDirty()
+
+    def updatePosition(self, left, top):  # moves the box and its text, keeping the size
+        if (left, top) == self.rect.topleft:
+            return
+        self.markDirty()  # old area
+        self.rect.topleft = (left, top)
+        self._updateTextPosition()
+        self.markDirty()
+
+    def _updateTextBlit(self):
+        self.textBlit, self._textSize = textCache.render(self.style.font, self._text, self.getTextColor())
+
+    def _updateTextPosition(self):
+        if self.style.centerTextInBox:
+            self.textPosition = (self.rect.left + self.rect.width / 2 - self._textSize[0] / 2,
+                                 self.rect.top + self.rect.height / 2 - self._textSize[1] / 2)
+        else:
+            self.textPosition = (self.rect.left, self.rect.top)
+
+    # attribute updates
+
+    def startDrawingBoxBackground(self):
+        self._fillBoxWithColor = True
+        self.markDirty()
+    def stopDrawingBoxBackground(self):
+        self._fillBoxWithColor = False
+        self.markDirty()
+
+    def makeVisible(self):
+        self._visible = True
+        self.markDirty()
+    def makeInvisible(self):
+        self._visible = False
+        self.markDirty()
+
+
+########################################################################################################################
+########################################################################################################################
+
+
+class CompactButton(CompactWordBox):
+    # a CompactWordBox that gets clicked and hovered like a Button, with the hover look of its style
+    # the look only changes when the mouse enters or leaves, then the text is looked up in its other color
+    __slots__ = ("functionIfClicked", "_hovers")
+
+    def __init__(self, rect, style, functionIfClicked=lambda: None, text='', visible=True):
+        self.functionIfClicked = functionIfClicked
+        self._hovers = False
+        super().__init__(rect, style, text=text, visible=visible)
+
+    def getTextColor(self):
+        if self._hovers and self.style.textColorChangesOnHover:
+            return self.style.textColorChangeColor
+        return self.style.textColor
+
+    def drawTheBorder(self, win):
+        style = self.style
+        if self._hovers:
+            width = style.growWidth if style.borderGrowOnHover else style.borderWidth
+            pygame.draw.rect(win, style.growColor, self.rect, width)
+        else:
+            pygame.draw.rect(win, style.borderColor, self.rect, style.borderWidth)
+
+    def drawTheBoxBackground(self, win):
+        color = self.getBackgroundColor()
+        if self._hovers and self.style.darkenOnHover:
+            if self._backgroundColor is None:
+                color = self.style.darkenedBackgroundColor
+            else:
+                color = Colors.darkenColor(color, amount=0.9)
+        win.fill(color, rect=self.rect)
+
+    def clickedOn(self, mp):
+        if not self._visible:
+            return False
+        if self.rect.collidepoint(mp):
+            self.functionIfClicked()
+            return True
+        return False
+
+    def hoverOver(self, mp):
+        if not self._visible:
+            return False
+        hovers = self.rect.collidepoint(mp)
+        if hovers != self._hovers:
+            self._hovers = hovers
+            if self.style.textColorChangesOnHover:
+                self._updateTextBlit()  # same size in either color, the text stays where it is
+            self.markDirty()
+        return self._hovers
@@ -2,6 +2,9 @@ import random
 class Colors:
     #values from https://en.wikipedia.org/wiki/Web_colors#X11_color_names
 
+    # every random color comes from this generator, seeding it makes a replayed game pick the same colors
+    rng = random.Random()
+
     # PINK COLORS
     PINK               = (255,192,203)
     LIGHTPINK          = (255,182,193)
@@ -165,9 +168,13 @@ class Colors:
         return tuple([(value-255)*amount+255 for value in color])
 
 
-    @staticmethod
-    def randColor(lowBound=0, highBound=255):
-        return tuple([random.randint(lowBound, highBound) for times in range(3)])
+    @classmethod
+    def seed(cls, seed):
+        cls.rng.seed(seed)
+
+    @classmethod
+    def randColor(cls, lowBound=0, highBound=255):
+        return tuple([cls.rng.randint(lowBound, highBound) for times in range(3)])
 
     @classmethod
     def randDarkColor(cls):
@@ -0,0 +1,90 @@
+# File name: DirtyRenderer.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class DirtyRenderer: draws a list of widgets, only redrawing and updating the areas they report as changed
+# Date: October 17th, 2026
+
+import pygame
+from FrameProfiler import NullProfiler
+
+
+class DirtyRenderer:
+    # retained rendering for a screen made of widgets (WordBox, Button, Grid, SimpleMenu)
+    # widgets report what changed through popDirtyRects(), only those areas get cleared, redrawn and
+    # passed to pygame.display.update(), a frame with no changes costs next to nothing
+    # with retained=False every frame is a full redraw, like the loops used to do
+    # profiler: times the drawing and the display update, and can add its overlay on top of the widgets
+    # display: a ScaledDisplay when win is drawn at a logical size and scaled into the window
+    def __init__(self, win, backgroundColor, widgets, retained=True, profiler=None, display=None):
+        self.win = win
+        self.display = display
+        self.backgroundColor = backgroundColor
+        self.retained = retained
+        self.profiler = profiler if profiler is not None else NullProfiler()
+        self.surface = self.profiler.wrapSurface(win)  # what the widgets draw on, the window itself when not profiling
+        self._overlays = self.profiler.getWidgets(win)  # always drawn last
+        self.widgets = list(widgets) + self._overlays  # in drawing order
+        self._fullRedraw = True  # the first frame always draws everything
+
+    def addWidget(self, widget):
+        self.widgets.insert(len(self.widgets) - len(self._overlays), widget)
+        self._fullRedraw = True
+
+    def requestFullRedraw(self):
+        self._fullRedraw = True
+
+    @staticmethod
+    def mergeRects(rects):
+        # joins overlapping rects so no area gets drawn twice
+        merged = []
+        for rect in rects:
+            rect = pygame.Rect(rect)
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
+
+    def _present(self, rects=None):
+        if self.display is not None:
+            self.display.present(rects)
+        elif rects is None:
+            pygame.display.update()
+        else:
+            pygame.display.update(rects)
+
+    def render(self):
+        # returns the list of areas that got updated on the screen
+        dirtyRects = []
+        for widget in self.widgets:
+            dirtyRects += widget.popDirtyRects()
+
+        if self._fullRedraw or not self.retained:
+            self._fullRedraw = False
+            self.surface.fill(self.backgroundColor)
+            for widget in self.widgets:
+                widget.draw(self.surface)
+            self.profiler.lap("draw")
+            self._present()
+            self.profiler.lap("display")
+            return [self.win.get_rect()]
+
+        screenRect = self.win.get_rect()
+        dirtyRects = [rect.clip(screenRect) for rect in self.mergeRects(dirtyRects)]
+        dirtyRects = [rect for rect in dirtyRects if rect.width > 0 and rect.height > 0]
+        if not dirtyRects:
+            self.profiler.lap("draw")
+            return dirtyRects
+
+        for area in dirtyRects:
+            self.win.set_clip(area)  # widgets draw whole cells, the clip keeps them inside the area
+            self.surface.fill(self.backgroundColor, area)
+            for widget in self.widgets:
+                if widget.getBounds().colliderect(area):
+                    widget.drawArea(self.surface, area)
+        self.win.set_clip(None)
+        self.profiler.lap("draw")
+        self._present(dirtyRects)
+        self.profiler.lap("display")
+        return dirtyRects
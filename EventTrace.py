@@ -0,0 +1,183 @@
+# File name: EventTrace.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class EventRecorder: a FrameScheduler that also writes every batch of events the game gets to a trace file
+#       class EventPlayer: a FrameScheduler stand-in handing the batches of a trace back, as fast as possible
+#       readTrace(): the header and batches of a trace file
+#       a headless replay that reports frame timings: python EventTrace.py session.wstrace [--puzzles puzzles.txt]
+# a game is recorded with WORDSEARCH_RECORD=session.wstrace python Main.py
+# Date: October 17th, 2026
+
+import os
+if __name__ == "__main__":
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # replays don't open a window
+
+import argparse
+import random
+import struct
+import sys
+import pygame
+from Colors import Colors
+from FrameScheduler import FrameScheduler, SECOND_TICK
+
+# file layout, all numbers little endian:
+#   header: magic, version, the seed of Colors.rng, window width and height
+#   then one batch per call to waitForEvents: milliseconds since the recording started and its event count,
+#   followed by its events: type, x, y and value
+# what x, y and value hold depends on the type, see EVENT_FIELDS, events of other types are left out
+MAGIC = b"WSTR"
+VERSION = 1
+HEADER = struct.Struct("<4sHQHH")
+BATCH = struct.Struct("<IH")
+EVENT = struct.Struct("<Hhhi")
+EVENT_FIELDS = {pygame.MOUSEMOTION: ("pos", None), pygame.MOUSEBUTTONDOWN: ("pos", "button"),
+                pygame.MOUSEBUTTONUP: ("pos", "button"), pygame.MOUSEWHEEL: (None, "y"),
+                pygame.KEYDOWN: (None, "key"), pygame.KEYUP: (None, "key"),
+                pygame.VIDEORESIZE: ("size", None), pygame.VIDEOEXPOSE: (None, None), pygame.QUIT: (None, None),
+                SECOND_TICK: (None, None)}  # event type -> (attribute put in x and y, attribute put in value)
+
+
+def packEvent(event):  # None for events the game doesn't use
+    fields = EVENT_FIELDS.get(event.type)
+    if fields is None:
+        return None
+    x, y = getattr(event, fields[0]) if fields[0] is not None else (0, 0)
+    value = getattr(event, fields[1]) if fields[1] is not None else 0
+    return EVENT.pack(event.type, x, y, value)
+
+
+def unpackEvent(data, offset):
+    eventType, x, y, value = EVENT.unpack_from(data, offset)
+    positionName, valueName = EVENT_FIELDS[eventType]
+    attributes = dict()
+    if positionName is not None:
+        attributes[positionName] = (x, y)
+    if valueName is not None:
+        attributes[valueName] = value
+    if eventType == pygame.VIDEORESIZE:
+        attributes["w"], attributes["h"] = x, y
+    return pygame.event.Event(eventType, attributes)
+
+
+def readTrace(path):
+    # returns (seed, window size, list of batches), a batch being (seconds since the start, list of events)
+    with open(path, 'rb') as fi:
+        data = fi.read()
+    if len(data) < HEADER.size:
+        raise ValueError("%s is not an event trace" % path)
+    magic, version, seed, width, height = HEADER.unpack_from(data, 0)
+    if magic != MAGIC:
+        raise ValueError("%s is not an event trace" % path)
+    if version != VERSION:
+        raise ValueError("%s is a version %d trace, expected %d" % (path, version, VERSION))
+    batches = []
+    offset = HEADER.size
+    while offset + BATCH.size <= len(data):
+        milliseconds, eventCount = BATCH.unpack_from(data, offset)
+        offset += BATCH.size
+        events = []
+        for eventInd in range(eventCount):
+            events.append(unpackEvent(data, offset))
+            offset += EVENT.size
+        batches.append((milliseconds / 1000, events))
+    return seed, (width, height), batches
+
+
+class EventRecorder(FrameScheduler):
+    # schedules frames like FrameScheduler and writes down what each wait returned, with when it returned
+    # Colors are seeded with seed, a random one when not given, so the replay picks the same colors
+    # getTime() is the time the last batch was handed out, a replay gets the exact same times
+    def __init__(self, path, maxFps=60, seed=None):
+        super().__init__(maxFps)
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        Colors.seed(self.seed)
+        self._file = open(path, 'wb')
+        self._headerWritten = False  # the window size is known once the game waits for its first events
+        self._start = super().getTime()
+        self._batchTime = 0
+
+    def waitForEvents(self, animating=False, timeout=None):
+        if not self._headerWritten:
+            self._file.write(HEADER.pack(MAGIC, VERSION, self.seed, *pygame.display.get_surface().get_size()))
+            self._headerWritten = True
+        events = super().waitForEvents(animating, timeout)
+        self._batchTime = round((super().getTime() - self._start) * 1000) / 1000
+        packedEvents = [packed for packed in map(packEvent, events) if packed is not None]
+        self._file.write(BATCH.pack(round(self._batchTime * 1000), len(packedEvents)) + b"".join(packedEvents))
+        return events
+
+    def getTime(self):
+        return self._batchTime
+
+    def close(self):
+        self._file.close()
+
+
+class EventPlayer:
+    # hands out the batches of a recorded game in order, without waiting, then a QUIT that ends the game
+    # timers don't run and delays don't wait, the game's time is the time each batch was recorded at
+    def __init__(self, path):
+        self.seed, self.windowSize, self.batches = readTrace(path)
+        Colors.seed(self.seed)
+        self.batchInd = 0
+        self._batchTime = 0
+
+    def waitForEvents(self, animating=False, timeout=None):
+        if self.batchInd >= len(self.batches):
+            return [pygame.event.Event(pygame.QUIT)]
+        self._batchTime, events = self.batches[self.batchInd]
+        self.batchInd += 1
+        return events
+
+    def getTime(self):
+        return self._batchTime
+
+    @staticmethod
+    def startSecondTimer():
+        pass  # the recorded ticks are in the batches
+
+    @staticmethod
+    def stopSecondTimer():
+        pass
+
+    @staticmethod
+    def delay(milliseconds):
+        pass
+
+
+def percentile(sortedValues, fraction):
+    return sortedValues[min(len(sortedValues) - 1, int(fraction * len(sortedValues)))]
+
+
+def main(argv=None):
+    from Game import Game
+    from FrameProfiler import FrameProfiler
+    from PuzzleLibrary import loadPuzzles
+
+    parser = argparse.ArgumentParser(description="Replays a recorded game headless and reports its frame times.")
+    parser.add_argument("trace")
+    parser.add_argument("--puzzles", default="puzzles.txt", help="the puzzles.txt file or .wslib library it was "
+                                                                 "recorded with")
+    parser.add_argument("--export", default=None, help="also write every frame to this csv or jsonl file")
+    args = parser.parse_args(argv)
+
+    player = EventPlayer(args.trace)
+    profiler = FrameProfiler(exportPath=args.export, historySize=None, showOverlay=False)
+    game = Game(loadPuzzles(args.puzzles), profiler=profiler, scheduler=player, resizable=True,
+                windowSize=player.windowSize)
+    game.start()
+
+    frameTimes = sorted(frame["frameMs"] for frame in profiler.history)
+    if not frameTimes:
+        print("no frames")
+        return 1
+    print("%d batches, %d frames" % (len(player.batches), len(frameTimes)))
+    print("frame ms: mean %.3f  p50 %.3f  p95 %.3f  p99 %.3f  max %.3f" % (
+        sum(frameTimes) / len(frameTimes), percentile(frameTimes, 0.5), percentile(frameTimes, 0.95),
+        percentile(frameTimes, 0.99), frameTimes[-1]))
+    print(" ".join("%s:%d" % bucket for bucket in profiler.getHistogram()))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
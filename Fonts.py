@@ -0,0 +1,74 @@
+# File name: Fonts.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class Fonts: a registry handing out shared pygame fonts, so the same font is only ever created once
+# Date: October 17th, 2026
+
+import os
+import pygame
+
+
+class Fonts:
+    # pygame.font.SysFont looks the family up and builds a new Font object on every call
+    # Fonts.get() resolves each (family, bold, italic) to a font file once and keeps one Font per
+    # (family, size, bold, italic), every widget asking for the same font gets the same instance
+    _fonts = dict()  # (family, size, bold, italic) -> pygame.font.Font
+    _specs = dict()  # pygame.font.Font -> (family, size, bold, italic), the other way around
+    _resolved = dict()  # (family, bold, italic) -> (font path, fake bold, fake italic)
+    createdCount = 0  # amount of Font objects created, to check nothing gets created twice
+
+    @staticmethod
+    def _recordResolution(fontPath, size, setBold, setItalic):  # constructor handed to SysFont
+        return fontPath, setBold, setItalic
+
+    @classmethod
+    def _resolve(cls, family, bold, italic):
+        key = (family, bold, italic)
+        if key not in cls._resolved:
+            # let SysFont do the lookup, including whether bold/italic have to be faked, but not build the font
+            cls._resolved[key] = pygame.font.SysFont(family, 0, bold, italic, constructor=cls._recordResolution)
+        return cls._resolved[key]
+
+    @classmethod
+    def get(cls, family="arial", size=12, bold=False, italic=False):
+        size = int(size)
+        key = (family, size, bold, italic)
+        font = cls._fonts.get(key)
+        if font is None:
+            fontPath, setBold, setItalic = cls._resolve(family, bold, italic)
+            font = pygame.font.Font(fontPath, size)
+            if setBold:
+                font.set_bold(True)
+            if setItalic:
+                font.set_italic(True)
+            cls._fonts[key] = font
+            cls._specs[font] = key
+            cls.createdCount += 1
+        return font
+
+    @classmethod
+    def getSpec(cls, font):
+        # the get() arguments that give this font, None for fonts that weren't made by get()
+        return cls._specs.get(font)
+
+    @classmethod
+    def getSignature(cls, family, bold=False, italic=False):
+        # what a font renders with: its file, with the file's size and modification time, and the faked styles
+        # two fonts with the same signature and size render the same text the same way
+        fontPath, setBold, setItalic = cls._resolve(family, bold, italic)
+        if fontPath is not None and os.path.isfile(fontPath):
+            stat = os.stat(fontPath)
+            return [fontPath, stat.st_size, stat.st_mtime_ns, setBold, setItalic]
+        return [fontPath, setBold, setItalic]
+
+    @classmethod
+    def prewarm(cls, fontSpecs):
+        # fontSpecs: tuples of get() arguments, eg. ("arial", 25, True)
+        for spec in fontSpecs:
+            cls.get(*spec)
+
+    @classmethod
+    def clear(cls):
+        cls._fonts.clear()
+        cls._specs.clear()
+        cls._resolved.clear()
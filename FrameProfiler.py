@@ -0,0 +1,263 @@
+# File name: FrameProfiler.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class NullProfiler: the profiler the game uses when nothing is measured, every call does nothing
+#       class FrameProfiler: per frame timings and draw call counts, a frame time histogram and csv/jsonl export
+#       class CountingSurface: stands in for the window while drawing and counts blits and fills
+#       class ProfilerOverlay: a widget showing the last frame's numbers, toggled with F3
+# Date: October 17th, 2026
+
+import csv
+import json
+import time
+from collections import deque
+import pygame
+from Fonts import Fonts
+from TextCache import textCache
+
+PHASES = ("events", "update", "draw", "display")  # the phases the game loops report, in order
+HISTOGRAM_LIMITS = (2, 4, 8, 16, 33, 50, 100)  # frame time buckets in ms, the last bucket is everything above
+DRAW_FUNCTIONS = ("rect", "line")  # pygame.draw functions counted while a FrameProfiler is installed
+TOGGLE_KEY = pygame.K_F3
+
+
+class NullProfiler:
+    # the game loops always talk to a profiler, this one keeps the loops as they were:
+    # no timers are read, the window is drawn to directly and nothing is wrapped
+    enabled = False
+
+    def beginFrame(self):
+        pass
+
+    def lap(self, phase):
+        pass
+
+    def endFrame(self, updatedRects=None):
+        pass
+
+    def handleEvent(self, event):
+        pass
+
+    def wrapSurface(self, win):
+        return win
+
+    def getWidgets(self, win):
+        return []
+
+    def close(self):
+        pass
+
+
+class CountingSurface:
+    # passed to the widgets instead of the window while profiling, counts what they draw
+    # everything else is handed to the real surface, pygame.draw gets the real surface through the
+    # wrappers FrameProfiler installs
+    def __init__(self, surface, profiler):
+        self.surface = surface
+        self.profiler = profiler
+
+    def blit(self, *args, **kwargs):
+        self.profiler.counts["blits"] += 1
+        return self.surface.blit(*args, **kwargs)
+
+    def blits(self, blitSequence, doreturn=True):
+        blitSequence = list(blitSequence)
+        self.profiler.counts["blits"] += len(blitSequence)
+        return self.surface.blits(blitSequence, doreturn)
+
+    def fill(self, *args, **kwargs):
+        self.profiler.counts["fills"] += 1
+        return self.surface.fill(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self.surface, name)
+
+
+class FrameProfiler:
+    # a frame is the work between beginFrame() and endFrame(), the time spent waiting for events is left out
+    # lap(phase) gives the time since the previous lap, or since beginFrame(), to that phase
+    # counts per frame:
+    #   renders: text rendered by font.render, every WordBox and grid renders through textCache so its misses count
+    #   blits, fills: calls on the window while the DirtyRenderer draws
+    #   draws: pygame.draw.rect and pygame.draw.line calls
+    # exportPath: every frame is appended to this file as it ends, as csv or as one json object per line (.jsonl)
+    # historySize: frames kept for the overlay's averages
+    def __init__(self, exportPath=None, historySize=120, showOverlay=True):
+        self.enabled = True
+        self.frameCount = 0
+        self.history = deque(maxlen=historySize)
+        self.histogram = [0] * (len(HISTOGRAM_LIMITS) + 1)
+        self.counts = self._newCounts()
+        self.phases = dict()
+        self._frameStart = None
+        self._lapStart = None
+        self._rendersAtStart = 0
+        self.overlay = ProfilerOverlay(self, visible=showOverlay)
+
+        self._exportFile = None
+        self._csvWriter = None
+        if exportPath is not None:
+            self._exportFile = open(exportPath, 'w', newline='')
+            if not exportPath.endswith(".jsonl"):
+                self._csvWriter = csv.writer(self._exportFile)
+                self._csvWriter.writerow(["frame", "frameMs"] + [phase + "Ms" for phase in PHASES]
+                                         + ["renders", "blits", "fills", "draws", "updatedRects"])
+
+        self._originalDrawFunctions = dict()
+        self.install()
+
+    # pygame.draw wrappers, only there while this profiler is
+
+    def install(self):
+        for name in DRAW_FUNCTIONS:
+            if name not in self._originalDrawFunctions:
+                self._originalDrawFunctions[name] = getattr(pygame.draw, name)
+                setattr(pygame.draw, name, self._countingDrawFunction(self._originalDrawFunctions[name]))
+
+    def uninstall(self):
+        for name, function in self._originalDrawFunctions.items():
+            setattr(pygame.draw, name, function)
+        self._originalDrawFunctions.clear()
+
+    def _countingDrawFunction(self, function):
+        def countingDrawFunction(surface, *args, **kwargs):
+            if isinstance(surface, CountingSurface):
+                surface = surface.surface
+            self.counts["draws"] += 1
+            return function(surface, *args, **kwargs)
+        return countingDrawFunction
+
+    # frames
+
+    @staticmethod
+    def _newCounts():
+        return {"renders": 0, "blits": 0, "fills": 0, "draws": 0}
+
+    def beginFrame(self):
+        self.counts = self._newCounts()
+        self.phases = dict()
+        self._rendersAtStart = textCache.misses
+        self._frameStart = self._lapStart = time.perf_counter()
+
+    def lap(self, phase):
+        if self._frameStart is None:
+            return
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0) + (now - self._lapStart) * 1000
+        self._lapStart = now
+
+    def endFrame(self, updatedRects=None):
+        if self._frameStart is None:
+            return
+        frameMs = (time.perf_counter() - self._frameStart) * 1000
+        self._frameStart = None
+        self.counts["renders"] = textCache.misses - self._rendersAtStart
+        frame = {"frame": self.frameCount, "frameMs": frameMs, "phases": self.phases, "counts": self.counts,
+                 "updatedRects": len(updatedRects) if updatedRects is not None else None}
+        self.frameCount += 1
+        self.history.append(frame)
+        bucket = 0
+        while bucket < len(HISTOGRAM_LIMITS) and frameMs >= HISTOGRAM_LIMITS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+        self._export(frame)
+        self.overlay.refresh()
+
+    def _export(self, frame):
+        if self._exportFile is None:
+            return
+        if self._csvWriter is None:
+            self._exportFile.write(json.dumps(frame) + "\n")
+        else:
+            counts = frame["counts"]
+            self._csvWriter.writerow([frame["frame"], "%.3f" % frame["frameMs"]]
+                                     + ["%.3f" % frame["phases"].get(phase, 0) for phase in PHASES]
+                                     + [counts["renders"], counts["blits"], counts["fills"], counts["draws"],
+                                        frame["updatedRects"]])
+
+    def getHistogram(self):
+        # list of (label, frame count), eg. ("<16ms", 120)
+        labels = ["<%dms" % limit for limit in HISTOGRAM_LIMITS] + [">=%dms" % HISTOGRAM_LIMITS[-1]]
+        return list(zip(labels, self.histogram))
+
+    # hooks for the game loops
+
+    def handleEvent(self, event):
+        if event.type == pygame.KEYDOWN and event.key == TOGGLE_KEY:
+            self.overlay.toggle()
+
+    def wrapSurface(self, win):
+        return CountingSurface(win, self)
+
+    def getWidgets(self, win):
+        # widgets the DirtyRenderer draws on top of everything else
+        self.overlay.place(win.get_rect())
+        return [self.overlay]
+
+    def close(self):
+        self.uninstall()
+        if self._exportFile is not None:
+            self._exportFile.close()
+            self._exportFile = None
+
+
+class ProfilerOverlay:
+    # a few lines of numbers in the bottom left corner of the window, drawn last
+    # its text is rendered with font.render directly, not through textCache, so it doesn't show up in the counts
+    def __init__(self, profiler, visible=True, font=None, textColor=(255, 255, 255), backgroundColor=(30, 30, 30)):
+        self.profiler = profiler
+        self.visible = visible
+        self.font = font or Fonts.get("arial", 12)
+        self.textColor = textColor
+        self.backgroundColor = backgroundColor
+        self.lineHeight = self.font.get_linesize()
+        self.rect = pygame.Rect(0, 0, 330, self.lineHeight * 4 + 6)
+        self._lines = []
+        self._dirty = visible
+
+    def place(self, windowRect):
+        self.rect.bottomleft = windowRect.bottomleft
+        self._dirty = self.visible
+
+    def toggle(self):
+        self.visible = not self.visible
+        self._dirty = True  # shows it, or restores what was under it
+
+    def refresh(self):
+        if not self.visible:
+            return
+        history = self.profiler.history
+        last = history[-1]
+        frameTimes = [frame["frameMs"] for frame in history]
+        self._lines = [
+            "frame %.2f ms   avg %.2f   max %.2f   (%d frames)" % (last["frameMs"], sum(frameTimes) / len(frameTimes),
+                                                              max(frameTimes), self.profiler.frameCount),
+            "   ".join("%s %.2f" % (phase, last["phases"].get(phase, 0)) for phase in PHASES),
+            "renders %(renders)d   blits %(blits)d   fills %(fills)d   draws %(draws)d" % last["counts"],
+            " ".join("%s:%d" % bucket for bucket in self.profiler.getHistogram()),
+        ]
+        self._dirty = True
+
+    # widget interface used by DirtyRenderer
+
+    def getBounds(self):
+        return self.rect
+
+    def popDirtyRects(self):
+        if not self._dirty:
+            return []
+        self._dirty = False
+        return [self.rect]
+
+    def draw(self, win):
+        if not self.visible:
+            return
+        if isinstance(win, CountingSurface):
+            win = win.surface  # the overlay's own drawing isn't part of the game's frame
+        win.fill(self.backgroundColor, self.rect)
+        for lineInd in range(len(self._lines)):
+            win.blit(self.font.render(self._lines[lineInd], True, self.textColor),
+                     (self.rect.left + 3, self.rect.top + 3 + lineInd * self.lineHeight))
+
+    def drawArea(self, win, area):
+        self.draw(win)
@@ -0,0 +1,52 @@
+# File name: FrameScheduler.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class FrameScheduler: hands out events to a game loop, sleeping while nothing happens
+# Date: October 17th, 2026
+
+import time
+import pygame
+
+SECOND_TICK = pygame.event.custom_type()  # posted once a second while a second timer runs
+
+
+class FrameScheduler:
+    # replaces busy polling with pygame.time.delay, a loop asks for its events with waitForEvents():
+    #   - when events are queued, or the loop is animating, it returns right away, but never faster than maxFps
+    #   - otherwise it blocks on pygame.event.wait until an event arrives, so an idle window uses no cpu
+    # things that change with time, like a clock showing seconds, start a timer so the wait wakes up when needed
+    # the game reads the time and waits through its scheduler, so EventTrace can record and replay both
+    def __init__(self, maxFps=60):
+        self.maxFps = maxFps
+        self.clock = pygame.time.Clock()
+
+    def waitForEvents(self, animating=False, timeout=None):
+        # timeout is in milliseconds, None waits as long as it takes
+        self.clock.tick(self.maxFps or 0)  # caps the frame rate, input waits at most one frame
+        events = pygame.event.get()
+        if events or animating:
+            return events
+        if timeout is None:
+            event = pygame.event.wait()
+        else:
+            event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:  # timed out
+            return []
+        return [event] + pygame.event.get()
+
+    @staticmethod
+    def startSecondTimer():
+        # a SECOND_TICK every second from now on, for displays counting seconds
+        pygame.time.set_timer(SECOND_TICK, 1000)
+
+    @staticmethod
+    def stopSecondTimer():
+        pygame.time.set_timer(SECOND_TICK, 0)
+
+    @staticmethod
+    def getTime():  # seconds, for timing a game
+        return time.monotonic()
+
+    @staticmethod
+    def delay(milliseconds):  # keeps what is on screen for a moment
+        pygame.time.delay(milliseconds)
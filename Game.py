@@ -7,28 +7,59 @@ import pygame
 pygame.init()
 from Grid import *
 from SimpleMenu import *
+from DirtyRenderer import DirtyRenderer
+from Fonts import Fonts
+from LetterMatrix import LetterMatrix
+from FrameScheduler import FrameScheduler
+from PuzzleSession import PuzzleSession
+from FrameProfiler import NullProfiler
+from ScaledDisplay import ScaledDisplay
+from TextCache import textCache
 
 class Game:
-    def __init__(self, puzzleDictData):
-        self.width = 720
-        self.height = 560
-        self.win = pygame.display.set_mode((self.width, self.height))
+    # dirtyRendering: only redraw what changed each frame instead of the whole window
+    # largePuzzleCellCount: puzzles with more cells are played on a MatrixWordSearchGrid when numpy is installed
+    # maxFps: the most frames drawn per second, the loops sleep until something happens
+    # profiler: a FrameProfiler to time every frame, F3 shows or hides its numbers
+    # logicalSize: the size everything is laid out and drawn at, scaled to fit windowSize or the resized window
+    # scheduler: where the events and the time come from, a FrameScheduler unless a game is recorded or replayed
+    # layoutCache: a LayoutCache keeping each puzzle's layout, answer key and rendered texts on disk
+    # minCellSize: puzzles whose letters would get smaller cells than this are shown through a viewport of
+    #              viewportCellSize cells instead, the mouse wheel zooms it, the arrow keys or a right drag scroll it
+    def __init__(self, puzzleDictData, dirtyRendering=True, largePuzzleCellCount=2500, maxFps=60, profiler=None,
+                 logicalSize=(720, 560), windowSize=None, resizable=False, fullscreen=False, scheduler=None,
+                 layoutCache=None, minCellSize=10, viewportCellSize=24):
+        self.dirtyRendering = dirtyRendering
+        self.largePuzzleCellCount = largePuzzleCellCount
+        self.minCellSize = minCellSize
+        self.viewportCellSize = viewportCellSize
+        self.scheduler = scheduler if scheduler is not None else FrameScheduler(maxFps)
+        self.profiler = profiler if profiler is not None else NullProfiler()
+        self.width, self.height = logicalSize
+        self.display = ScaledDisplay(logicalSize, windowSize=windowSize, resizable=resizable, fullscreen=fullscreen)
+        self.win = self.display.surface  # drawn at the logical size, the window itself when nothing is scaled
+        self._layouts = dict()  # getPuzzleLayout's results by puzzle name and logical size
+        self.layoutCache = layoutCache
         pygame.display.set_caption('Word Search by Sebastien Marleau')
         self.puzzleDictData = puzzleDictData
+        # fonts used by every menu and puzzle screen, the letter font size depends on the puzzle
+        Fonts.prewarm([("arial", 45), ("arial", 20), ("arial", 30, True), ("arial", 25, True), ("arial", 15)])
 
 
     def start(self):
         while True:
             nameOfPuzzle = self.menu()
-            if nameOfPuzzle == "Exit":
+            if nameOfPuzzle is None or nameOfPuzzle == "Exit":
                 break  # exit
             backToMenu = self.startPuzzle(nameOfPuzzle)  # returns True if back button is pressed or on win
             if not backToMenu:
                 break  # exit
+        self.profiler.close()
         pygame.quit()
 
 
     def menu(self):
+        self.scheduler.stopSecondTimer()  # nothing changes with time in the menu
         backgroundColor = Colors.randReallyLightColor()
         listOfWords = list(self.puzzleDictData.keys())
         amountOfPuzzles = len(listOfWords)
@@ -40,24 +71,32 @@ class Game:
         heightOfButtons = 50
 
         menu = SimpleMenu(overallMenuRect=menuRect, listOfWordsForOptions=listOfWords, optionsXCellNum=1,
-                          optionsYCellNum=amountOfPuzzles, title="Word Search", titleFont=pygame.font.SysFont("arial", 45),
+                          optionsYCellNum=amountOfPuzzles, title="Word Search", titleFont=Fonts.get("arial", 45),
                           optionsCellWidth=280, optionsCellHeight=heightOfButtons,
                           optionsBoxBackgroundColor=Colors.darkenColor(backgroundColor),
-                          optionsFont=pygame.font.SysFont("arial", 20), drawOptionsButtonsBorder=False,
+                          optionsFont=Fonts.get("arial", 20), drawOptionsButtonsBorder=False,
                           visible=True)
+        renderer = DirtyRenderer(self.win, backgroundColor, [menu], retained=self.dirtyRendering,
+                                 profiler=self.profiler, display=self.display)
         mp = (0,0)
+        self.profiler.beginFrame()
         while True:
-            pygame.time.delay(5)
-            self.win.fill(backgroundColor)
-            menu.draw(self.win)
-            pygame.display.update()
+            self.profiler.lap("events")
+            self.profiler.endFrame(renderer.render())
 
-            for event in pygame.event.get():
+            events = self.scheduler.waitForEvents()
+            self.profiler.beginFrame()  # the wait isn't part of the frame
+            for event in events:
+                self.profiler.handleEvent(event)
+                self.display.handleEvent(event)  # a resized window only gets the picture scaled again
                 if event.type == pygame.QUIT:
                     return None
 
+                if event.type == pygame.VIDEOEXPOSE:
+                    renderer.requestFullRedraw()  # the window content got lost
+
                 if event.type == pygame.MOUSEMOTION:
-                    mp = pygame.mouse.get_pos()
+                    mp = self.display.toLogical(event.pos)
                     menu.hoverOver(mp)
 
                 if event.type == pygame.MOUSEBUTTONDOWN:
@@ -67,8 +106,17 @@ class Game:
 
 
 
-    def startPuzzle(self, puzzleName):
-        backgroundColor = Colors.randReallyLightColor()
+    def getLayoutSettings(self):
+        # the settings a puzzle screen's layout depends on besides the puzzle and logical size, part of the
+        # layout cache's key so a layout made with other settings is never used
+        return self.minCellSize, self.viewportCellSize, self.largePuzzleCellCount
+
+    def getPuzzleLayout(self, puzzleName):
+        # where everything of a puzzle screen goes and the letter font, worked out once per puzzle and resolution
+        key = (puzzleName, (self.width, self.height))
+        layout = self._layouts.get(key)
+        if layout is not None:
+            return layout
         puzzleData = self.puzzleDictData[puzzleName]
         puzzleLeft = 50
         puzzleTop = 100
@@ -76,23 +124,16 @@ class Game:
         puzzleMaxWidth = self.width-250
         cellHeight = puzzleMaxHeight // puzzleData.rowCount
         cellWidth = puzzleMaxWidth //puzzleData.columnCount
-        cellHeight = cellWidth = min(cellHeight, cellWidth)
+        cellHeight = cellWidth = max(1, min(cellHeight, cellWidth))
+        viewRect = None
+        if cellHeight < self.minCellSize:
+            # too small to play, the grid gets readable cells and only part of it is shown
+            cellHeight = cellWidth = self.viewportCellSize
+            viewRect = pygame.Rect(puzzleLeft, puzzleTop, min(puzzleMaxWidth, cellWidth*puzzleData.columnCount),
+                                   min(puzzleMaxHeight, cellHeight*puzzleData.rowCount))
         puzzleHeight = cellHeight*puzzleData.rowCount
         puzzleWidth = cellWidth*puzzleData.columnCount
-
-
-
-        puzzleGridRect = pygame.Rect(puzzleLeft, puzzleTop, puzzleWidth, puzzleHeight)
-
-        foundWords = list()  # set gets added to as words are found
-        wordSearch = WordSearchGrid(puzzleGridRect, xCellNum=puzzleData.columnCount, yCellNum=puzzleData.rowCount,
-                                    cellWidth=cellWidth, cellHeight=cellHeight, textListForLetters=puzzleData.letters,
-                                    wordList=puzzleData.words, foundWordList=foundWords,
-                                    font=pygame.font.SysFont("arial", cellHeight//2),
-                                    boxBackgroundColor=Colors.lightenColor(backgroundColor, amount=0.8))
-        #  title right above the puzzle grid
-        puzzleThemeTitle = WordBox(pygame.Rect(puzzleLeft,0,puzzleWidth, puzzleTop),text=puzzleName,
-                                   font=pygame.font.SysFont("arial", 30,bold=True),drawBorder=False)
+        titleWidth = viewRect.width if viewRect is not None else puzzleWidth
 
         wordGridCellHeight = 40
         wordGridYCellNum = len(puzzleData.words)
@@ -104,70 +145,158 @@ class Game:
         wordGridWidth = self.width-puzzleLeft-puzzleMaxWidth-50
         wordGridHeight = wordGridCellHeight * len(puzzleData.words)
 
+        # rects are copied by whoever uses them, boxes can move theirs
+        layout = {"cellSize": cellHeight, "letterFont": Fonts.get("arial", cellHeight//2),
+                  "puzzleGridRect": pygame.Rect(puzzleLeft, puzzleTop, puzzleWidth, puzzleHeight),
+                  "viewRect": viewRect,  # None when the whole grid fits
+                  "titleRect": pygame.Rect(puzzleLeft,0,titleWidth, puzzleTop),
+                  "wordGridRect": pygame.Rect(wordGridLeft, wordGridTop, wordGridWidth, wordGridHeight),
+                  "wordGridCellHeight": wordGridCellHeight,
+                  "wordsTitleRect": pygame.Rect(wordGridLeft, puzzleTop, wordGridWidth, 50),
+                  "selectedLettersRect": pygame.Rect(wordGridLeft, 0, wordGridWidth, puzzleTop),
+                  "backButtonRect": pygame.Rect(wordGridLeft+wordGridWidth//2-50, wordGridTop + wordGridHeight+25,
+                                                100, 50),
+                  "timeRect": pygame.Rect(0,0,100,puzzleTop)}
+        self._layouts[key] = layout
+        return layout
+
+    def startPuzzle(self, puzzleName):
+        backgroundColor = Colors.randReallyLightColor()
+        puzzleData = self.puzzleDictData[puzzleName]
+        # a puzzle opened before has its layout, answer key and texts in the layout cache
+        compiled = None
+        if self.layoutCache is not None:
+            compiled = self.layoutCache.load(puzzleData, (self.width, self.height), self.getLayoutSettings())
+        if compiled is not None:
+            layout, answerKey = compiled
+            self._layouts[(puzzleName, (self.width, self.height))] = layout
+        else:
+            layout, answerKey = self.getPuzzleLayout(puzzleName), None
+            if self.layoutCache is not None:
+                textCache.startRecording()  # stored with the layout once the first frame is drawn
+        cellHeight = cellWidth = layout["cellSize"]
+        puzzleGridRect = pygame.Rect(layout["puzzleGridRect"])
+        viewRect = layout["viewRect"]
+        minZoom = self.minCellSize / cellHeight  # zooming out never shows more cells than the smallest cells would
+
+        # selection, found words and time
+        session = PuzzleSession.fromPuzzleData(puzzleData, answerKey=answerKey, clock=self.scheduler.getTime)
+        if (puzzleData.rowCount * puzzleData.columnCount > self.largePuzzleCellCount
+                and LetterMatrix.isAvailable()):
+            # no Button per letter for large puzzles
+            wordSearch = MatrixWordSearchGrid(puzzleGridRect, xCellNum=puzzleData.columnCount,
+                                              yCellNum=puzzleData.rowCount, cellWidth=cellWidth,
+                                              cellHeight=cellHeight,
+                                              letterMatrix=LetterMatrix.fromPuzzleData(puzzleData),
+                                              wordList=puzzleData.words, foundWordList=session.foundWordList,
+                                              font=layout["letterFont"], session=session,
+                                              viewRect=viewRect, minZoom=minZoom,
+                                              boxBackgroundColor=Colors.lightenColor(backgroundColor, amount=0.8))
+        else:
+            wordSearch = WordSearchGrid(puzzleGridRect, xCellNum=puzzleData.columnCount, yCellNum=puzzleData.rowCount,
+                                        cellWidth=cellWidth, cellHeight=cellHeight,
+                                        textListForLetters=puzzleData.letters,
+                                        wordList=puzzleData.words, foundWordList=session.foundWordList,
+                                        font=layout["letterFont"], session=session,
+                                        viewRect=viewRect, minZoom=minZoom,
+                                        boxBackgroundColor=Colors.lightenColor(backgroundColor, amount=0.8))
+        #  title right above the puzzle grid
+        puzzleThemeTitle = WordBox(pygame.Rect(layout["titleRect"]),text=puzzleName,
+                                   font=Fonts.get("arial", 30, bold=True),drawBorder=False)
+
         # grid containing possible words in puzzle grid
-        wordGrid = CrossOutWordGrid(pygame.Rect(wordGridLeft, wordGridTop, wordGridWidth, wordGridHeight),
-                                    listOfWords=puzzleData.words, xCellNum=1, yCellNum=wordGridYCellNum,
-                                    cellHeight=wordGridCellHeight,cellWidth=wordGridWidth, centerY=False,
+        wordGridRect = pygame.Rect(layout["wordGridRect"])
+        wordGrid = CrossOutWordGrid(wordGridRect,
+                                    listOfWords=puzzleData.words, xCellNum=1, yCellNum=len(puzzleData.words),
+                                    cellHeight=layout["wordGridCellHeight"],cellWidth=wordGridRect.width, centerY=False,
                                     drawBoxesAroundWords=False,centerX=True ,boxBackgroundColor=Colors.darkenColor(backgroundColor, amount=0.95),
                                     drawGridBorder=True)
         # word box right above the list of words
-        wordBoxThatSaysWords = WordBox(pygame.Rect(wordGridLeft, puzzleTop, wordGridWidth, 50), text="Words",
-                                       font=pygame.font.SysFont("arial", 25, bold=True), drawBorder=False,
+        wordBoxThatSaysWords = WordBox(pygame.Rect(layout["wordsTitleRect"]), text="Words",
+                                       font=Fonts.get("arial", 25, bold=True), drawBorder=False,
                                        boxBackgroundColor=Colors.darkenColor(backgroundColor, amount=0.95))
 
         # text updates as letters are chosen
-        currentlySelectedLettersBox = WordBox(pygame.Rect(wordGridLeft, 0, wordGridWidth, puzzleTop), text="",
-                                              font=pygame.font.SysFont("arial", 25, bold=True), drawBorder=False,
+        currentlySelectedLettersBox = WordBox(pygame.Rect(layout["selectedLettersRect"]), text="",
+                                              font=Fonts.get("arial", 25, bold=True), drawBorder=False,
                                               boxBackgroundColor=None)
-        backButton = Button(pygame.Rect(wordGridLeft+wordGridWidth//2-50, wordGridTop + wordGridHeight+25, 100, 50), text="Back",
-                            font=pygame.font.SysFont("arial", 15), boxBackgroundColor=Colors.darkenColor(backgroundColor, amount=0.95),
+        backButton = Button(pygame.Rect(layout["backButtonRect"]), text="Back",
+                            font=Fonts.get("arial", 15), boxBackgroundColor=Colors.darkenColor(backgroundColor, amount=0.95),
                             darkenOnHover=True, fillBoxWithColor=True, drawBorder=False)
-        oldTime = pygame.time.get_ticks()
-        timeBox = WordBox(pygame.Rect(0,0,100,puzzleTop), text="0",font=pygame.font.SysFont("arial", 25, bold=True),
+        timeBox = WordBox(pygame.Rect(layout["timeRect"]), text="0",font=Fonts.get("arial", 25, bold=True),
                           drawBorder=False,boxBackgroundColor=None)
+        # in drawing order
+        renderer = DirtyRenderer(self.win, backgroundColor,
+                                 [timeBox, currentlySelectedLettersBox, wordSearch, backButton, wordGrid,
+                                  puzzleThemeTitle, wordBoxThatSaysWords], retained=self.dirtyRendering,
+                                 profiler=self.profiler, display=self.display)
         mp = (0,0)
+        viewport = wordSearch.viewport  # None when the whole grid fits
+        panFrom = None  # where the mouse was when the view was last dragged, None when it isn't being dragged
+        scrollKeys = {pygame.K_LEFT: (-1, 0), pygame.K_RIGHT: (1, 0), pygame.K_UP: (0, -1), pygame.K_DOWN: (0, 1)}
+        self.scheduler.startSecondTimer()  # wakes the loop up when the time shown changes, stopped by menu()
+        self.profiler.beginFrame()
         while True:
-            pygame.time.delay(10)
-            time = pygame.time.get_ticks()-oldTime
-            self.win.fill(backgroundColor)
-            timeBox.updateText(str(time // 1000))
-            timeBox.draw(self.win)
-
+            self.profiler.lap("events")
+            # the boxes only report a change when their text actually changes
+            timeBox.updateText(str(int(session.getElapsed())))
             currentlySelectedLettersBox.updateText(wordSearch.getPossibleWordsFromSelectedSquares()[0])
-            currentlySelectedLettersBox.draw(self.win)
-
-            wordSearch.draw(self.win)
-            backButton.draw(self.win)
-            wordGrid.draw(self.win)
-            puzzleThemeTitle.draw(self.win)
-            wordBoxThatSaysWords.draw(self.win)
-
-            pygame.display.update()
+            self.profiler.lap("update")
+            self.profiler.endFrame(renderer.render())
+            if compiled is None and self.layoutCache is not None:
+                # every text the puzzle starts with is rendered now
+                self.layoutCache.store(puzzleData, (self.width, self.height), layout, session.answerKey,
+                                       textCache.stopRecording(), self.getLayoutSettings())
+                compiled = (layout, session.answerKey)
 
 
-            for event in pygame.event.get():
+            events = self.scheduler.waitForEvents()
+            self.profiler.beginFrame()  # the wait isn't part of the frame
+            for event in events:
+                self.profiler.handleEvent(event)
+                self.display.handleEvent(event)  # a resized window only gets the picture scaled again
                 if event.type == pygame.QUIT:
                     return False
 
+                if event.type == pygame.VIDEOEXPOSE:
+                    renderer.requestFullRedraw()  # the window content got lost
+
                 if event.type == pygame.MOUSEMOTION:
-                    mp = pygame.mouse.get_pos()
+                    mp = self.display.toLogical(event.pos)
+                    if panFrom is not None:
+                        viewport.scrollBy(panFrom[0] - mp[0], panFrom[1] - mp[1])
+                        panFrom = mp
                     wordSearch.hoverOver(mp)
                     backButton.hoverOver(mp)
 
+                if viewport is not None:
+                    # zoomed by the wheel around the mouse, scrolled by the arrow keys or dragged with another button
+                    if event.type == pygame.MOUSEWHEEL and viewport.viewRect.collidepoint(mp):
+                        viewport.zoomAt(mp, 1.25 ** event.y)
+                    if event.type == pygame.KEYDOWN and event.key in scrollKeys:
+                        stepX, stepY = scrollKeys[event.key]  # a quarter of the view per key press
+                        viewport.scrollBy(stepX * viewport.viewRect.width // 4, stepY * viewport.viewRect.height // 4)
+                    if event.type == pygame.MOUSEBUTTONUP and event.button in (2, 3):
+                        panFrom = None
+                    if event.type == pygame.MOUSEBUTTONDOWN and event.button != 1:
+                        if event.button in (2, 3):
+                            panFrom = mp
+                        continue  # only the left button plays, the wheel also sends buttons 4 and 5
+
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     wordSearch.clickedOn(mp)
-                    wordGrid.crossOut(foundWords)  # crosses out words when found
+                    wordGrid.crossOut(session.foundWordList)  # crosses out words when found
                     if backButton.clickedOn(mp):
                         return True  # main menu
 
-                    if len(foundWords) == len(puzzleData.words):
+                    if session.isComplete():
                         wordGrid.draw(self.win)  # tick last word found
-                        pygame.display.update()  # user sees completed state
-                        pygame.time.delay(400)
+                        self.display.present()  # user sees completed state
+                        self.scheduler.delay(400)
                         self.win.fill(backgroundColor)  # erase
                         playerWin = WordBox(pygame.Rect(0, 0, self.width, self.height), text="YOU WIN",
-                                            font=pygame.font.SysFont("arial", 45), drawBorder=False)
+                                            font=Fonts.get("arial", 45), drawBorder=False)
                         playerWin.draw(self.win)  # display "win"
-                        pygame.display.update()
-                        pygame.time.delay(2000)
+                        self.display.present()
+                        self.scheduler.delay(2000)
                         return True  # main menu
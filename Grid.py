@@ -6,11 +6,18 @@
 #           class ButtonGrid: extends Grid and makes the cells Button objects
 #           class MenuGrid: extends ButtonsGrid with attributes beffiting a menu selection grid
 #           class WordSearchGrid: extends ButtonGrid and has all functionality of a WordSearch game
+#           class MatrixWordSearchGrid: extends Grid, a WordSearchGrid drawn from a LetterMatrix for large puzzles
 #           class CrossOutWordGrid: extends WordGrid, and adds functionality to cross out specific words
+#           class Viewport: the part of a grid shown in a window area, scrolled and zoomed, for grids that don't fit
 # Date: April 9th, 2019
 
+import math
 import pygame
 from BoxComponents import *
+from Fonts import Fonts
+from TextCache import textCache
+from LetterMatrix import numpy
+from PuzzleSession import PuzzleSession
 
 
 class Grid:
@@ -18,9 +25,12 @@ class Grid:
     # handles the location placement of the cells, as well as their drawing
     # also supports column and row adding
     # children classes should overwrite drawCell() and addCell()
+    # changed areas are collected in dirtyRects, which cells with their own dirty tracking share
     def __init__(self, gridRect, xCellNum, yCellNum, cellWidth, cellHeight, centerX=True,
                  centerY=True, borderColor=(0, 0, 0), drawGridBorder=True, visible=True):
 
+        self.dirtyRects = []
+        self.bounds = gridRect  # initialized in initCells()
         self.gridRect = gridRect
         self.xCellNum = xCellNum
         self.yCellNum = yCellNum
@@ -34,6 +44,12 @@ class Grid:
         self.centerY = centerY
         self.drawGridBorder = drawGridBorder
         self.visible = visible
+        # a Viewport when only part of the grid is shown, cells and dirty rects stay where gridRect puts them and the
+        # viewport maps them to the window. Only the word search grids draw through one
+        self.viewport = None
+        # True while every cell sits on the origin + cell size + gap lattice, which lets cellIndexAt() use arithmetic
+        # set to False if cells get moved around by hand, hit-testing then falls back to checking every cell
+        self.regularLayout = True
         self.initGaps()
         self.cellList = None  # initialized in initCells()
         self.initCells()
@@ -54,6 +70,10 @@ class Grid:
     def newCell(self, left, top, width, height):  # used in initCells()
         return pygame.Rect(left, top, width, height)
 
+    def adoptCell(self, cell):  # used in newCell() of children, cells report their changes to the grid
+        cell.dirtyRects = self.dirtyRects
+        return cell
+
     def initCells(self):
         self.cellList = []
 
@@ -71,6 +91,121 @@ class Grid:
             # move down
             currentY += self.cellHeight + self.gapY
 
+        self.updateBounds()
+        self.markDirty()
+
+    def updateBounds(self):  # the grid rect and every cell
+        self.bounds = self.gridRect
+        if self.xCellNum > 0 and self.yCellNum > 0:
+            self.bounds = self.bounds.union(self.getCellRect(0, 0)).union(self.getCellRect(-1, -1))
+
+    def growCells(self):
+        # brings cellList up to yCellNum rows of xCellNum cells, used by addColumn() and addRow()
+        # only the missing cells are created, the others are kept and only moved if the gaps changed
+        self.markDirty()  # old area
+        oldGaps = (self.gapX, self.gapY)
+        self.initGaps()
+        moveCells = (self.gapX, self.gapY) != oldGaps
+        strideX = self.cellWidth + self.gapX
+        strideY = self.cellHeight + self.gapY
+        left = self.gridRect.left + self.gapX
+        for rowInd in range(self.yCellNum):
+            if rowInd == len(self.cellList):
+                self.cellList.append([])
+            row = self.cellList[rowInd]
+            top = self.gridRect.top + self.gapY + rowInd * strideY
+            if moveCells:
+                for columnInd in range(len(row)):
+                    self.moveCell(row[columnInd], left + columnInd * strideX, top)
+            for columnInd in range(len(row), self.xCellNum):
+                row.append(self.newCell(left + columnInd * strideX, top, self.cellWidth, self.cellHeight))
+        self.updateBounds()
+        self.markDirty()
+
+    def moveCell(self, cell, left, top):  # used in growCells(), children with other cells overwrite it
+        cell.topleft = (left, top)
+
+    # spatial index
+
+    def getCellRect(self, rowInd, columnInd):
+        return self.cellList[rowInd][columnInd]
+
+    def cellIndexAt(self, mp):
+        # maps a position straight to the (row, column) of the cell containing it, None if no cell contains it
+        strideX = self.cellWidth + self.gapX
+        strideY = self.cellHeight + self.gapY
+        if not self.regularLayout or strideX <= 0 or strideY <= 0:
+            return self._scanForCellIndex(mp)
+
+        columnInd = int((mp[0] - self.gridRect.left - self.gapX) // strideX)
+        rowInd = int((mp[1] - self.gridRect.top - self.gapY) // strideY)
+        # cell positions get truncated to ints, so a point on an edge can belong to a neighbouring cell
+        for checkRow in (rowInd, rowInd - 1, rowInd + 1):
+            if not 0 <= checkRow < self.yCellNum:
+                continue
+            for checkColumn in (columnInd, columnInd - 1, columnInd + 1):
+                if 0 <= checkColumn < self.xCellNum and self.getCellRect(checkRow, checkColumn).collidepoint(mp):
+                    return checkRow, checkColumn
+        return None  # in a gap between cells
+
+    def _scanForCellIndex(self, mp):  # fallback for irregular layouts
+        for rowInd in range(len(self.cellList)):
+            for columnInd in range(len(self.cellList[rowInd])):
+                if self.getCellRect(rowInd, columnInd).collidepoint(mp):
+                    return rowInd, columnInd
+        return None
+
+    def getCellAt(self, mp):
+        coords = self.cellIndexAt(mp)
+        if coords is None:
+            return None
+        return self.cellList[coords[0]][coords[1]]
+
+    def cellsInArea(self, area):
+        # yields the cells overlapping area, only visiting the rows and columns the area spans
+        strideX = self.cellWidth + self.gapX
+        strideY = self.cellHeight + self.gapY
+        if not self.regularLayout or strideX <= 0 or strideY <= 0:
+            rowRange = range(len(self.cellList))
+            columnRange = None
+        else:
+            # one extra line each way for the truncated cell positions
+            firstRow = max(0, int((area.top - self.gridRect.top - self.gapY) // strideY) - 1)
+            lastRow = min(self.yCellNum - 1, int((area.bottom - self.gridRect.top - self.gapY) // strideY) + 1)
+            firstColumn = max(0, int((area.left - self.gridRect.left - self.gapX) // strideX) - 1)
+            lastColumn = min(self.xCellNum - 1, int((area.right - self.gridRect.left - self.gapX) // strideX) + 1)
+            rowRange = range(firstRow, lastRow + 1)
+            columnRange = range(firstColumn, lastColumn + 1)
+        for rowInd in rowRange:
+            for columnInd in (columnRange if columnRange is not None else range(len(self.cellList[rowInd]))):
+                if self.getCellRect(rowInd, columnInd).colliderect(area):
+                    yield self.cellList[rowInd][columnInd]
+
+    def toContent(self, mp):
+        # the grid position shown at a window position, None when a viewport doesn't show that window position
+        if self.viewport is None:
+            return mp
+        if not self.viewport.viewRect.collidepoint(mp):
+            return None
+        return self.viewport.toContent(mp)
+
+    # dirty areas
+
+    def getBounds(self):
+        if self.viewport is not None:
+            return self.viewport.viewRect
+        return self.bounds
+
+    def markDirty(self, rect=None):
+        self.dirtyRects.append(self.bounds if rect is None else rect)
+
+    def popDirtyRects(self):
+        rects = self.dirtyRects[:]
+        del self.dirtyRects[:]  # cleared in place since the cells share the list
+        if self.viewport is not None:
+            return self.viewport.toViewRects(rects)
+        return rects
+
     def draw(self, win):
         if not self.visible:
             return
@@ -80,24 +215,32 @@ class Grid:
             for cell in row:
                 self.drawCell(win, cell)
 
+    def drawArea(self, win, area):  # used by DirtyRenderer, only draws the cells overlapping area
+        if not self.visible:
+            return
+        if self.drawGridBorder:
+            pygame.draw.rect(win, self.borderColor, self.gridRect, 1)
+        for cell in self.cellsInArea(area):
+            self.drawCell(win, cell)
+
     def drawCell(self, win, cell):  # used in draw()
         pygame.draw.rect(win, self.borderColor, cell, 1)
 
-    def addColumn(self):
-        self.xCellNum += 1
+    def addColumn(self, count=1):  # new cells are added on the right
+        self.xCellNum += count
         self.gridRect = pygame.Rect(self.gridRect.left,
                                     self.gridRect.top,
-                                    self.gridRect.width + self.cellHeight + self.gapX,
+                                    self.gridRect.width + count * (self.cellWidth + self.gapX),
                                     self.gridRect.height)
-        self.initCells()
+        self.growCells()
 
-    def addRow(self):
-        self.yCellNum += 1
+    def addRow(self, count=1):  # new cells are added at the bottom
+        self.yCellNum += count
         self.gridRect = pygame.Rect(self.gridRect.left,
                                     self.gridRect.top,
                                     self.gridRect.width,
-                                    self.gridRect.height + self.cellHeight + self.gapY)
-        self.initCells()
+                                    self.gridRect.height + count * (self.cellHeight + self.gapY))
+        self.growCells()
 
 
 ########################################################################################################################
@@ -110,11 +253,12 @@ class WordGrid(Grid):
     # has a function to get the WordBox instance containing a specific word
     def __init__(self, gridRect, listOfWords, xCellNum, yCellNum, cellWidth, cellHeight,
                  centerX=True, centerY=True, borderColor=Colors.BLACK, boxBackgroundColor=None,
-                 fillBoxesWithColor=False, centerTextInBox=True, font=pygame.font.SysFont("arial", 12),
+                 fillBoxesWithColor=False, centerTextInBox=True, font=Fonts.get("arial", 12),
                  drawBoxesAroundWords=True, boxesColor=Colors.BLACK, drawGridBorder=True, visible=True):
         # words
         self.listOfWords = listOfWords  # list must contain as many words as there are boxes
         self._listOfWordsIter = None  # initialized in initSquares()
+        self._wordBoxes = dict()  # word -> first WordBox with that text, initialized in initCells()
         # background color
         self.fillBoxesWithColor = fillBoxesWithColor
         self.boxBackgroundColor = boxBackgroundColor
@@ -131,24 +275,31 @@ class WordGrid(Grid):
 
     def initCells(self):
         self._listOfWordsIter = iter(self.listOfWords)  # reset iter
+        self._wordBoxes = dict()
         super().initCells()
 
     def newCell(self, left, top, width, height):
-        text = next(self._listOfWordsIter)  # program crashes without enough words
+        text = next(self._listOfWordsIter)  # program crashes without enough words, added cells take the next ones
+
+        wordBox = self.adoptCell(WordBox(pygame.Rect(left, top, width, height), text=text, font=self.font,
+                                         borderColor=self.borderColor, boxBackgroundColor=self.boxBackgroundColor,
+                                         centerTextInBox=self.centerTextInBox, drawBorder=self.drawBoxesAroundWords,
+                                         fillBoxWithColor=self.fillBoxesWithColor))
+        # index of the boxes by word, boxes whose text gets changed afterwards keep being found by their old word
+        self._wordBoxes.setdefault(text, wordBox)
+        return wordBox
 
-        return WordBox(pygame.Rect(left, top, width, height), text=text, font=self.font,
-                       borderColor=self.borderColor, boxBackgroundColor=self.boxBackgroundColor,
-                       centerTextInBox=self.centerTextInBox, drawBorder=self.drawBoxesAroundWords,
-                       fillBoxWithColor=self.fillBoxesWithColor)
+    def moveCell(self, cell, left, top):
+        cell.updatePosition(left, top)
 
     def drawCell(self, win, cell):
         cell.draw(win)
 
-    def getWordBoxWithWord(self, word):
-        for row in self.cellList:
-            for wordBox in row:
-                if wordBox.getText() == word:
-                    return wordBox
+    def getCellRect(self, rowInd, columnInd):
+        return self.cellList[rowInd][columnInd].rect
+
+    def getWordBoxWithWord(self, word):  # None if no box has the word
+        return self._wordBoxes.get(word)
 
 
 ########################################################################################################################
@@ -159,13 +310,15 @@ class ButtonGrid(Grid):
     # handles the creation of Buttons instances used as cells, their clicking and hovering
     # has a list of functions that can be added to the buttons
     # has a function to get the Button instance ogf a button with a particular word
+    # compactCells: the cells are CompactButtons sharing the grid's cellStyle instead of Buttons, for grids with
+    #               many cells
     def __init__(self, gridRect, listOfWords, xCellNum, yCellNum, cellWidth, cellHeight,
                  listOfFunctions=[], centerX=True, centerY=True, borderColor=Colors.BLACK, buttonsGrowOnHover=True,
                  borderGrowColor=Colors.BLACK, boxBackgroundColor=None,
                  fillBoxesWithColor=False, buttonsDarkenOnHover=False,
-                 centerTextInBox=True, font=pygame.font.SysFont("arial", 12), textColorChangesOnHover=False,
+                 centerTextInBox=True, font=Fonts.get("arial", 12), textColorChangesOnHover=False,
                  textColorChangeColor=Colors.BLACK,
-                 drawBoxesAroundWords=True, drawGridBorder=True, visible=True):
+                 drawBoxesAroundWords=True, drawGridBorder=True, visible=True, compactCells=False):
 
         #  lists
         self.listOfWords = listOfWords
@@ -191,6 +344,10 @@ class ButtonGrid(Grid):
         self.buttonsGrowOnHover = buttonsGrowOnHover
         self.borderGrowColor = borderGrowColor
 
+        self._hoveredButton = None  # the button the mouse was last over, reset in initCells()
+        self.compactCells = compactCells
+        self.cellStyle = None  # the BoxStyle of compact cells, initialized in initCells()
+
         super().__init__(gridRect=gridRect, xCellNum=xCellNum, yCellNum=yCellNum, cellWidth=cellWidth,
                          cellHeight=cellHeight, centerX=centerX, centerY=centerY, borderColor=borderColor,
                          drawGridBorder=drawGridBorder, visible=visible)
@@ -199,6 +356,15 @@ class ButtonGrid(Grid):
         # reset iters
         self._listOfWordsIter = iter(self.listOfWords)
         self._listOfFunctionsIter = iter(self.listOfFunctions)
+        self._hoveredButton = None
+        if self.compactCells:
+            self.cellStyle = BoxStyle(font=self.font, borderColor=self.borderColor,
+                                      boxBackgroundColor=self.boxBackgroundColor, growColor=self.borderGrowColor,
+                                      drawBorder=self.drawBoxesAroundWords, fillBoxWithColor=self.fillBoxesWithColor,
+                                      darkenOnHover=self.buttonsDarkenOnHover,
+                                      borderGrowOnHover=self.buttonsGrowOnHover,
+                                      textColorChangesOnHover=self.textColorChangesOnHover,
+                                      textColorChangeColor=self.textColorChangeColor)
         super().initCells()
 
     def newCell(self, left, top, width, height):
@@ -209,35 +375,42 @@ class ButtonGrid(Grid):
         if self.addFunctions:
             function = next(self._listOfFunctionsIter)
         else:
-            function = lambda: None  # empty function
+            function = self._doNothing  # empty function, shared by all cells
         # program will crash without enough functions or words if lists aren't empty
 
-        return Button(pygame.Rect(left, top, width, height), functionIfClicked=function, text=text, font=self.font,
-                      borderColor=self.borderColor, boxBackgroundColor=self.boxBackgroundColor,
-                      growColor=self.borderGrowColor,
-                      drawBorder=self.drawBoxesAroundWords, fillBoxWithColor=self.fillBoxesWithColor,
-                      darkenOnHover=self.buttonsDarkenOnHover, borderGrowOnHover=self.buttonsGrowOnHover,
-                      textColorChangesOnHover=self.textColorChangesOnHover, textColorChangeColor=self.textColorChangeColor)
+        if self.compactCells:
+            return self.adoptCell(CompactButton(pygame.Rect(left, top, width, height), self.cellStyle,
+                                                functionIfClicked=function, text=text))
+        return self.adoptCell(Button(pygame.Rect(left, top, width, height), functionIfClicked=function, text=text,
+                                     font=self.font, borderColor=self.borderColor,
+                                     boxBackgroundColor=self.boxBackgroundColor, growColor=self.borderGrowColor,
+                                     drawBorder=self.drawBoxesAroundWords, fillBoxWithColor=self.fillBoxesWithColor,
+                                     darkenOnHover=self.buttonsDarkenOnHover, borderGrowOnHover=self.buttonsGrowOnHover,
+                                     textColorChangesOnHover=self.textColorChangesOnHover,
+                                     textColorChangeColor=self.textColorChangeColor))
+
+    @staticmethod
+    def _doNothing():
+        pass
+
+    def moveCell(self, cell, left, top):
+        cell.updatePosition(left, top)
 
     def drawCell(self, win, cell):
         cell.draw(win)
 
+    def getCellRect(self, rowInd, columnInd):
+        return self.cellList[rowInd][columnInd].rect
+
     def returnTextOfClickedButton(self, mp):
-        if self.gridRect.collidepoint(mp):
-            for row in self.cellList:
-                for cell in row:
-                    if cell.clickedOn(mp):
-                        return cell.getText()
+        button = self.getCellAt(mp)
+        if button is not None and button.clickedOn(mp):
+            return button.getText()
         return None
 
     def clickedOn(self, mp):
-        if not self.gridRect.collidepoint(mp):
-            return False
-        for row in self.cellList:
-            for button in row:
-                if button.clickedOn(mp):
-                    return True
-        return False
+        button = self.getCellAt(mp)
+        return button is not None and button.clickedOn(mp)
 
     def getButtonWithWord(self, word):
         for row in self.cellList:
@@ -247,13 +420,13 @@ class ButtonGrid(Grid):
 
 
     def hoverOver(self, mp):
-        if not self.gridRect.collidepoint(mp):
+        button = self.getCellAt(mp)
+        if self._hoveredButton is not None and self._hoveredButton is not button:
+            self._hoveredButton.hoverOver(mp)  # mouse left it, so it stops hovering
+        self._hoveredButton = button
+        if button is None:
             return False
-        for row in self.cellList:
-            for button in row:
-                if button.hoverOver(mp):
-                    return True
-        return False
+        return button.hoverOver(mp)
 
 ########################################################################################################################
 ########################################################################################################################
@@ -266,7 +439,7 @@ class MenuGrid(ButtonGrid):
                  listOfFunctions=[], listOfWords=[], centerX=True, centerY=True, borderColor=Colors.BLACK,
                  buttonsGrowOnHover=False, borderGrowColor=Colors.BLACK, drawBoxesAroundWords=False,
                  fillBoxesWithColor=True, buttonsDarkenOnHover=True, centerTextInBox=True,
-                 font=pygame.font.SysFont("arial", 12), textColorChangesOnHover=False,
+                 font=Fonts.get("arial", 12), textColorChangesOnHover=False,
                  textColorChangeColor=Colors.BLACK, drawGridBorder=False, visible=True):
 
         super().__init__(gridRect, listOfWords, xCellNum, yCellNum, cellWidth, cellHeight,
@@ -286,85 +459,195 @@ class MenuGrid(ButtonGrid):
 class WordSearchGrid(ButtonGrid):
     # A grid of letters with many functions aimed towards a word search game
     # Being a specific class, most attributes are chosen for it already
+    # answerKey: (start, end) -> word as built by Solver.buildAnswerKey, built from the letters when not given
+    # session: the PuzzleSession played on the grid, made from the letters, words and answer key when not given
+    # viewRect: for grids bigger than the space they get, only the part seen through viewRect is drawn and clicked,
+    #           see Viewport. minZoom: how small the viewport can zoom the squares, until the grid fits by default
+    # compactCells: squares are CompactButtons sharing one style, as Buttons they take several times the memory
     def __init__(self, gridRect, xCellNum, yCellNum, cellWidth, cellHeight, textListForLetters, wordList,
-                 foundWordList, boxBackgroundColor, font=pygame.font.SysFont("arial", 20), drawBoxesAroundLetters=False,
-                 centerX=False, centerY=False, visible=True):
+                 foundWordList, boxBackgroundColor, font=Fonts.get("arial", 20), drawBoxesAroundLetters=False,
+                 centerX=False, centerY=False, visible=True, answerKey=None, session=None, viewRect=None,
+                 minZoom=None, compactCells=True):
 
         super().__init__(gridRect, textListForLetters, xCellNum, yCellNum, cellWidth, cellHeight, centerX=centerX,
                          centerY=centerY, buttonsGrowOnHover=False, font=font,
                          boxBackgroundColor=boxBackgroundColor,
-                         drawBoxesAroundWords=drawBoxesAroundLetters, drawGridBorder=False, visible=visible)
-        # used in selection and its calculation
-        self.firstSelecSquare = None
-        self.lastSelecSquare = None
+                         drawBoxesAroundWords=drawBoxesAroundLetters, drawGridBorder=False, visible=visible,
+                         compactCells=compactCells)
+        # the selection, found words and answer key
+        if session is None:
+            session = PuzzleSession(yCellNum, xCellNum, textListForLetters, wordList, foundWordList=foundWordList,
+                                    answerKey=answerKey)
+        self.session = session
+        # used in drawing the selection
+        self.selection = None  # (anchor, direction, length), see PuzzleSession.getSelection()
         self.selSquares = list()
-        # the set is added to as words are found. Progress is known by evaluating this set outside the class
-        self.foundWordList = foundWordList
-        self.wordList = wordList
+        self._possibleWords = ("", "")  # the letters of the selection read both ways, kept until it changes
         # colors for the word selection
         self.currentColor = Colors.randLightColor()
         self.pastColors = set()
+        if viewRect is not None:
+            self.viewport = Viewport(viewRect, self.bounds, minZoom=minZoom)
 
 
-    def clickedOn(self, mp):
-        if not self.gridRect.collidepoint(mp):
-            return
-        for rowInd in range(self.yCellNum):
-            for columnInd in range(self.xCellNum):
-
-                if self.cellList[rowInd][columnInd].clickedOn(mp):
-                    if self.firstSelecSquare is None:
-                        # no squares currently selected
-                        self.firstSelecSquare = (rowInd, columnInd)
-                        self.selSquares.append(self.cellList[rowInd][columnInd])
-                        # ^ the square gets colored as soon as it is clicked, vs when the mouse is moved
-                        return
-                    else:
-                        # a square is already selected
-                        # get word between two squares selected
-                        possibleWords = self.getPossibleWordsFromSelectedSquares()
-                        for word in self.wordList:
-                            # check if word is valid
-                            if word in possibleWords and word not in self.foundWordList:
-                                # update list
-                                self.foundWordList.append(word)
-                                # permanently change background of squares
-                                self.changeBackgroundColorOfSelectedSquares()
-                        # reset
-                        self.firstSelecSquare = None
-                        self.lastSelecSquare = None
-                        self.selSquares = list()
-                        return
+    # the four ways a line goes through the grid, as (row step, column step), the other four directions
+    # go along the same lines backwards
+    ORIENTATIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
 
-    def hoverOver(self, mp):
-        if self.firstSelecSquare is None:
-            return
-        for rowInd in range(self.yCellNum):
-            for columnInd in range(self.xCellNum):
+    # grids covering more pixels than this draw their squares every time instead of keeping a layer of them
+    maxLayerPixels = 2048 * 2048
 
-                if self.cellList[rowInd][columnInd].hoverOver(mp):  # if mouse is over square
-                    coords = (rowInd, columnInd)
-                    if self.inAllowedDirection(self.firstSelecSquare, coords) and coords != self.lastSelecSquare:
-                        # square change in an allowed direction with first square
-                        self.lastSelecSquare = coords
-                        self.updateSelectedSquares()
+    def initCells(self):
+        super().initCells()
+        self._buildLines()
+        self.invalidateLayer()
+
+    def growCells(self):
+        oldRowCount = len(self.cellList)
+        oldColumnCount = len(self.cellList[0]) if self.cellList else 0
+        super().growCells()
+        # new letters lengthen lines or make new ones, and can make new places for the words
+        # only what the new squares touch is worked out again, the cost follows the size of what was added
+        if oldRowCount == 0 or oldColumnCount == 0 or not self._extendLines(oldRowCount, oldColumnCount):
+            self._buildLines()
+        self.invalidateLayer()
+        if self.viewport is not None:
+            self.viewport.setContentRect(self.bounds)
+        self.session.growLetters("".join(self._lines[0][rowInd][1] for rowInd in range(self.yCellNum)),
+                                 self.yCellNum, self.xCellNum)
+
+    def invalidateLayer(self):  # for after changing squares directly, the layer is rendered again on the next draw
+        self._layer = None
+        self._layerParent = None
+
+    def _getLayer(self):
+        # the grid as it looks without a selection: background, colors of found words and letters
+        # rendered once, then only the squares of a found word are drawn on it again
+        # None when the grid is too big for one, or only part of it is seen through a viewport
+        if self.viewport is not None:
+            return None
+        if self._layer is None:
+            bounds = self.bounds
+            if bounds.width * bounds.height > self.maxLayerPixels or bounds.left < 0 or bounds.top < 0:
+                return None
+            # squares draw at window positions, so the layer is the grid's part of a surface reaching the window origin
+            self._layerParent = pygame.Surface(bounds.bottomright)
+            self._layerParent.set_clip(bounds)
+            self._layer = self._layerParent.subsurface(bounds)
+            self._drawSquares(self._layerParent)
+        return self._layer
+
+    def _drawSquares(self, win):
+        win.fill(rect=self.gridRect, color=self.boxBackgroundColor)
+        super().draw(win)
 
-    @staticmethod
-    def sameRow(coords1, coords2):
-        return coords1[0] == coords2[0]
+    def _buildLines(self):
+        # every row, column and diagonal of the grid, with its letters as one string each way
+        # a selection is always part of one of these, so its squares and letters are slices instead of new lists
+        #   self._lines[orientation][lineKey] = (squares, letters, letters reversed)
+        # each square holds one letter
+        letters = [[square.getText() for square in row] for row in self.cellList]
+        self._lines = []
+        for squareLines, letterLines in zip(self._cutLines(self.cellList), self._cutLines(letters)):
+            self._lines.append(dict())
+            for lineKey in squareLines:
+                lineLetters = "".join(letterLines[lineKey])
+                self._lines[-1][lineKey] = (squareLines[lineKey], lineLetters, lineLetters[::-1])
+
+    def _cutLines(self, rows):
+        # the items of a list of rows grouped into the lines of each orientation, as lineKey -> list of items
+        # line keys and positions along the lines are the ones _lineKeyAndPosition gives
+        # rows are copied, the rows of cellList grow by themselves in growCells()
+        rowCount, columnCount = self.yCellNum, self.xCellNum
+        return [{rowInd: list(rows[rowInd]) for rowInd in range(rowCount)},
+                {columnInd: [row[columnInd] for row in rows] for columnInd in range(columnCount)},
+                {lineKey: [rows[rowInd][rowInd + lineKey] for rowInd in range(max(0, -lineKey),
+                                                                              min(rowCount, columnCount - lineKey))]
+                 for lineKey in range(1 - rowCount, columnCount)},
+                {lineKey: [rows[rowInd][lineKey - rowInd] for rowInd in range(max(0, lineKey - columnCount + 1),
+                                                                              min(rowCount, lineKey + 1))]
+                 for lineKey in range(rowCount + columnCount - 1)}]
+
+    def _extendLines(self, oldRowCount, oldColumnCount):
+        # adds the squares outside the old oldRowCount x oldColumnCount grid to the lines they are on, returns False
+        # when a line would get squares other than at its start or end, which growing right or down never does
+        newSquares = [(rowInd, columnInd) for rowInd in range(oldRowCount)
+                      for columnInd in range(oldColumnCount, self.xCellNum)]
+        newSquares += [(rowInd, columnInd) for rowInd in range(oldRowCount, self.yCellNum)
+                       for columnInd in range(self.xCellNum)]
+        extendedLines = []
+        for orientationInd in range(len(self.ORIENTATIONS)):
+            added = dict()  # lineKey -> [(position, square)]
+            for rowInd, columnInd in newSquares:
+                lineKey, position = self._lineKeyAndPosition(orientationInd, rowInd, columnInd)
+                added.setdefault(lineKey, []).append((position, self.cellList[rowInd][columnInd]))
+            lines = self._lines[orientationInd]
+            extended = dict()
+            for lineKey, squares in added.items():
+                squares.sort(key=lambda item: item[0])
+                newSquareList = [square for position, square in squares]
+                newLetters = "".join(square.getText() for square in newSquareList)
+                oldSquares, oldLetters, oldReversed = lines.get(lineKey, ([], "", ""))
+                if squares[0][0] == len(oldSquares) and squares[-1][0] == len(oldSquares) + len(squares) - 1:
+                    extended[lineKey] = (oldSquares + newSquareList, oldLetters + newLetters,
+                                         newLetters[::-1] + oldReversed)
+                elif squares[0][0] == 0 and squares[-1][0] == len(squares) - 1:
+                    extended[lineKey] = (newSquareList + oldSquares, newLetters + oldLetters,
+                                         oldReversed + newLetters[::-1])
+                else:
+                    return False
+            extendedLines.append(extended)
+        for lines, extended in zip(self._lines, extendedLines):
+            lines.update(extended)
+        return True
+
+    def _lineKeyAndPosition(self, orientationInd, rowInd, columnInd):
+        # which line of an orientation goes through a square, and how far along that line the square is
+        if orientationInd == 0:  # row
+            return rowInd, columnInd
+        if orientationInd == 1:  # column
+            return columnInd, rowInd
+        if orientationInd == 2:  # down and right
+            return columnInd - rowInd, min(rowInd, columnInd)
+        return rowInd + columnInd, rowInd - max(0, rowInd + columnInd - (self.xCellNum - 1))  # down and left
 
-    @staticmethod
-    def sameColumn(coords1, coords2):
-        return coords1[1] == coords2[1]
+    def clickedOn(self, mp):
+        mp = self.toContent(mp)
+        if mp is None:
+            return
+        coords = self.cellIndexAt(mp)
+        if coords is None:
+            return
+        rowInd, columnInd = coords
+        if not self.cellList[rowInd][columnInd].clickedOn(mp):
+            return
 
-    @staticmethod
-    def sameDiag(coords1, coords2):
-        return abs(coords1[0] - coords2[0]) == abs(coords1[1] - coords2[1])
+        if self.session.firstSelecSquare is None:
+            # no squares currently selected
+            self.session.startSelection((rowInd, columnInd))
+            self.updateSelectedSquares()
+            # ^ the square gets colored as soon as it is clicked, vs when the mouse is moved
+        else:
+            # a square is already selected, the session looks up the word between the two squares
+            if self.session.validateSelection() is not None:
+                # permanently change background of squares
+                self.changeBackgroundColorOfSelectedSquares()
+            # reset
+            self.session.clearSelection()
+            self.updateSelectedSquares()
 
-    @classmethod
-    def inAllowedDirection(cls, coords1, coords2):
-        return (cls.sameRow(coords1, coords2) or cls.sameColumn(coords1, coords2)
-                or cls.sameDiag(coords1, coords2))
+    def hoverOver(self, mp):
+        if self.session.firstSelecSquare is None:
+            return
+        mp = self.toContent(mp)  # outside a viewport the selection keeps its last square
+        if mp is None:
+            return
+        coords = self.cellIndexAt(mp)  # the square the mouse is over
+        if coords is None:
+            return
+        if self.session.extendSelection(coords):
+            # square change in an allowed direction with first square
+            self.updateSelectedSquares()
 
 
     def changeBackgroundColorOfSelectedSquares(self):  # used on squares where a word is found
@@ -373,51 +656,323 @@ class WordSearchGrid(ButtonGrid):
                 # letter has not been in a found word
                 square.updateBackgroundColor(Colors.lightenColor(self.currentColor, amount=0.6))
                 square.startDrawingBoxBackground()
+                if self._layer is not None:
+                    square.draw(self._layerParent)
         # don't reuse same color
         self.pastColors.add(self.currentColor)
         while self.currentColor in self.pastColors:
             self.currentColor = Colors.randLightColor()
 
+    def markSelectionDirty(self):
+        for square in self.selSquares:
+            self.markDirty(square.rect)
+
     def updateSelectedSquares(self):
-        self.selSquares = list()
-        rows = [x for x in range(self.firstSelecSquare[0], self.lastSelecSquare[0] + 1)]
-        if len(rows) == 0:
-            # go in opposite direction
-            rows = [x for x in range(self.firstSelecSquare[0], self.lastSelecSquare[0] - 1, -1)]
-
-        columns = [x for x in range(self.firstSelecSquare[1], self.lastSelecSquare[1] + 1)]
-        if len(columns) == 0:
-            # go in opposite direction
-            columns = [x for x in range(self.firstSelecSquare[1], self.lastSelecSquare[1] - 1, -1)]
-
-        if len(rows) == 1:  # selected squares in same row
-            for columnInd in columns:
-                self.selSquares.append(self.cellList[rows[0]][columnInd])
-        elif len(columns) == 1:  # selected squares in same column
-            for rowInd in rows:
-                self.selSquares.append(self.cellList[rowInd][columns[0]])
-        else:  # diagonal
-            for innerInd in range(len(columns)):  # rows and columns have same length
-                self.selSquares.append(self.cellList[rows[innerInd]][columns[innerInd]])
+        self.markSelectionDirty()  # old selection
+        self.selection = self.session.getSelection()
+        if self.selection is None:
+            self.selSquares = list()
+            self._possibleWords = ("", "")
+        else:
+            self.selSquares, self._possibleWords = self._sliceSelection(*self.selection)
+        self.markSelectionDirty()
+
+    def _sliceSelection(self, anchor, direction, length):
+        # the squares and letters of a selection, cut out of the line it is on
+        if direction in self.ORIENTATIONS:
+            orientationInd, step = self.ORIENTATIONS.index(direction), 1
+        else:
+            orientationInd, step = self.ORIENTATIONS.index((-direction[0], -direction[1])), -1
+        lineKey, position = self._lineKeyAndPosition(orientationInd, *anchor)
+        squares, letters, reversedLetters = self._lines[orientationInd][lineKey]
+        if step == 1:
+            word = letters[position:position + length]
+            selSquares = squares[position:position + length]
+        else:  # backwards along the line, the reversed letters read the right way
+            reversedPosition = len(letters) - 1 - position
+            word = reversedLetters[reversedPosition:reversedPosition + length]
+            selSquares = squares[position - length + 1:position + 1][::-1]
+        return selSquares, (word, word[::-1])
+
+    def _drawView(self, win, area):
+        # the squares seen through the part of the viewport in area, at the viewport's zoom
+        # only the squares in view are visited, so this costs the same for any size of grid
+        viewport = self.viewport
+        area = viewport.viewRect.clip(area)
+        if not self.visible or area.width <= 0 or area.height <= 0:
+            return
+        clip = win.get_clip()
+        win.set_clip(area.clip(clip))
+        win.fill(self.boxBackgroundColor, area)
+        font = viewport.scaleFont(self.font)
+        selected = set(self.selSquares)
+        blits = []
+        for square in self.cellsInArea(viewport.toContentRect(area)):
+            rect = viewport.toView(square.rect)
+            if square in selected:
+                win.fill(self.currentColor, rect)
+            elif square.getBackgroundColor() != self.boxBackgroundColor:  # part of a found word
+                win.fill(square.getBackgroundColor(), rect)
+            if self.drawBoxesAroundWords:
+                pygame.draw.rect(win, self.borderColor, rect, 1)
+            surface, size = textCache.render(font, square.getText(), square.getTextColor())
+            blits.append((surface, (rect.centerx - size[0] // 2, rect.centery - size[1] // 2)))
+        win.blits(blits, doreturn=False)
+        win.set_clip(clip)
 
     def draw(self, win):
-        win.fill(rect=self.gridRect, color=self.boxBackgroundColor)
-        super().draw(win)
+        if self.viewport is not None:
+            self._drawView(win, self.viewport.viewRect)
+            return
+        layer = self._getLayer() if self.visible else None
+        if layer is None:
+            self._drawSquares(win)
+        else:
+            win.blit(layer, self.bounds.topleft)
         # draw selection color over squares
         for square in self.selSquares:
             win.fill(self.currentColor, square.rect)
             # text is erased, so redraw
             square.drawTheText(win)
 
-    def getPossibleWordsFromSelectedSquares(self):
-        charList = []
+    def drawArea(self, win, area):
+        if self.viewport is not None:
+            self._drawView(win, area)
+            return
+        layer = self._getLayer() if self.visible else None
+        if layer is None:
+            win.fill(rect=self.gridRect.clip(area), color=self.boxBackgroundColor)
+            super().drawArea(win, area)
+        else:
+            area = self.bounds.clip(area)
+            win.blit(layer, area.topleft, area.move(-self.bounds.left, -self.bounds.top))
         for square in self.selSquares:
-            charList.append(square.getText())
+            if square.rect.colliderect(area):
+                win.fill(self.currentColor, square.rect)
+                square.drawTheText(win)
 
-        word1 = "".join(charList)
-        charList.reverse()
-        word2 = "".join(charList)
-        return word1, word2
+    def getPossibleWordsFromSelectedSquares(self):  # worked out when the selection changes, not on every call
+        return self._possibleWords
+
+
+########################################################################################################################
+########################################################################################################################
+
+
+class MatrixWordSearchGrid(Grid):
+    # The same game as WordSearchGrid, for puzzles too large to have a Button per letter
+    # letters and cell states live in a LetterMatrix, no widget is created for any cell:
+    # drawing blits one shared surface per letter at computed positions, only for the cells being drawn
+    # viewRect and minZoom: a viewport as in WordSearchGrid
+    def __init__(self, gridRect, xCellNum, yCellNum, cellWidth, cellHeight, letterMatrix, wordList,
+                 foundWordList, boxBackgroundColor, font=Fonts.get("arial", 20), textColor=Colors.BLACK,
+                 centerX=False, centerY=False, visible=True, answerKey=None, session=None, viewRect=None,
+                 minZoom=None):
+
+        self.letterMatrix = letterMatrix
+        self.boxBackgroundColor = boxBackgroundColor
+        self.font = font
+        self.textColor = textColor
+        self._glyphs = dict()  # (letter code, font, cell size) -> (surface, offset of the surface in its cell)
+
+        super().__init__(gridRect, xCellNum, yCellNum, cellWidth, cellHeight, centerX=centerX, centerY=centerY,
+                         drawGridBorder=False, visible=visible)
+        # the selection, found words and answer key, as in WordSearchGrid
+        if session is None:
+            session = PuzzleSession(yCellNum, xCellNum, letterMatrix.text(), wordList, foundWordList=foundWordList,
+                                    answerKey=answerKey)
+        self.session = session
+        # used in drawing the selection
+        self.selection = None  # (anchor, direction, length)
+        self._possibleWords = ("", "")  # the letters of the selection read both ways, kept until it changes
+        self._selectedRect = None  # area of the highlighted cells, redrawn when the selection changes
+        # colors for the word selection
+        self.currentColor = Colors.randLightColor()
+        self.pastColors = set()
+        if viewRect is not None:
+            self.viewport = Viewport(viewRect, self.bounds, minZoom=minZoom)
+
+    def initCells(self):  # cells are computed from the matrix when needed, there are no cell objects
+        self.cellList = []
+        self.bounds = self.gridRect
+        self.markDirty()
+
+    # a LetterMatrix has a fixed size and the grid has no letters to give new cells, refused before anything changes
+    def addColumn(self, count=1):
+        raise TypeError("a MatrixWordSearchGrid can't grow, build a new one from a bigger LetterMatrix instead")
+
+    def addRow(self, count=1):
+        raise TypeError("a MatrixWordSearchGrid can't grow, build a new one from a bigger LetterMatrix instead")
+
+    def growCells(self):
+        raise TypeError("a MatrixWordSearchGrid can't grow, build a new one from a bigger LetterMatrix instead")
+
+    def getCellRect(self, rowInd, columnInd):
+        return pygame.Rect(self.gridRect.left + self.gapX + columnInd * (self.cellWidth + self.gapX),
+                           self.gridRect.top + self.gapY + rowInd * (self.cellHeight + self.gapY),
+                           self.cellWidth, self.cellHeight)
+
+    def _getGlyph(self, code, font, cellWidth, cellHeight):
+        key = (code, font, cellWidth, cellHeight)
+        glyph = self._glyphs.get(key)
+        if glyph is None:
+            surface, size = textCache.render(font, chr(code), self.textColor)
+            glyph = (surface, (cellWidth / 2 - size[0] / 2, cellHeight / 2 - size[1] / 2))
+            self._glyphs[key] = glyph
+        return glyph
+
+    # selection
+
+    def clickedOn(self, mp):
+        mp = self.toContent(mp)
+        if mp is None:
+            return
+        coords = self.cellIndexAt(mp)
+        if coords is None:
+            return
+
+        if self.session.firstSelecSquare is None:
+            # no squares currently selected
+            self.session.startSelection(coords)
+            self.updateSelectedSquares()
+        else:
+            # a square is already selected, the session looks up the word between the two squares
+            if self.session.validateSelection() is not None:
+                self.changeBackgroundColorOfSelectedSquares()
+            # reset
+            self.session.clearSelection()
+            self.updateSelectedSquares()
+
+    def hoverOver(self, mp):
+        if self.session.firstSelecSquare is None:
+            return
+        mp = self.toContent(mp)  # outside a viewport the selection keeps its last square
+        if mp is None:
+            return
+        coords = self.cellIndexAt(mp)  # the square the mouse is over
+        if coords is None:
+            return
+        if self.session.extendSelection(coords):
+            # square change in an allowed direction with first square
+            self.updateSelectedSquares()
+
+    def getSelectedRect(self):  # the area covered by the selection, None if nothing is selected
+        if self.session.firstSelecSquare is None:
+            return None
+        first, last = self.session.getSelectionEnds()
+        return self.getCellRect(*first).union(self.getCellRect(*last))
+
+    def updateSelectedSquares(self):
+        if self._selectedRect is not None:
+            self.markDirty(self._selectedRect)  # old selection
+        self.letterMatrix.setHighlight(self.session.firstSelecSquare, self.session.lastSelecSquare)
+        self.selection = self.session.getSelection()
+        if self.selection is None:
+            self._possibleWords = ("", "")
+        else:
+            word1 = self.letterMatrix.selectionText(*self.session.getSelectionEnds())
+            self._possibleWords = (word1, word1[::-1])
+        self._selectedRect = self.getSelectedRect()
+        if self._selectedRect is not None:
+            self.markDirty(self._selectedRect)
+
+    def changeBackgroundColorOfSelectedSquares(self):  # used on squares where a word is found
+        colorId = self.letterMatrix.addColor(Colors.lightenColor(self.currentColor, amount=0.6))
+        self.letterMatrix.markFound(*self.session.getSelectionEnds(), colorId)
+        self.markDirty(self.getSelectedRect())
+        # don't reuse same color
+        self.pastColors.add(self.currentColor)
+        while self.currentColor in self.pastColors:
+            self.currentColor = Colors.randLightColor()
+
+    def getPossibleWordsFromSelectedSquares(self):  # worked out when the selection changes, not on every call
+        return self._possibleWords
+
+    # drawing
+
+    def _drawCells(self, win, rowRange, columnRange, geometry=None):
+        # geometry: (left, top, strideX, strideY, cellWidth, cellHeight, font) of the cells on win, the grid's own
+        # when not given. A viewport's can be fractions, cells then start and end on the pixel their edge falls in
+        matrix = self.letterMatrix
+        if geometry is None:
+            geometry = (self.gridRect.left + self.gapX, self.gridRect.top + self.gapY, self.cellWidth + self.gapX,
+                        self.cellHeight + self.gapY, self.cellWidth, self.cellHeight, self.font)
+        left, top, strideX, strideY, cellWidth, cellHeight, font = geometry
+        rowSlice = slice(rowRange.start, rowRange.stop)
+        columnSlice = slice(columnRange.start, columnRange.stop)
+
+        # backgrounds, only for the cells that have one
+        colorIds = matrix.colorIds[rowSlice, columnSlice]
+        highlight = matrix.highlight[rowSlice, columnSlice]
+        for rowOffset, columnOffset in zip(*colorIds.nonzero()):
+            color = matrix.palette[colorIds[rowOffset, columnOffset]]
+            win.fill(color, self._cellArea(left + (columnRange.start + columnOffset) * strideX,
+                                           top + (rowRange.start + rowOffset) * strideY, cellWidth, cellHeight))
+        for rowOffset, columnOffset in zip(*highlight.nonzero()):
+            win.fill(self.currentColor, self._cellArea(left + (columnRange.start + columnOffset) * strideX,
+                                                       top + (rowRange.start + rowOffset) * strideY,
+                                                       cellWidth, cellHeight))
+
+        # letters
+        codes = matrix.letters[rowSlice, columnSlice]
+        glyphs = {code: self._getGlyph(code, font, cellWidth, cellHeight) for code in numpy.unique(codes).tolist()}
+        blits = []
+        for rowOffset, rowCodes in enumerate(codes.tolist()):
+            y = top + (rowRange.start + rowOffset) * strideY
+            x = left + columnRange.start * strideX
+            for code in rowCodes:
+                surface, offset = glyphs[code]
+                blits.append((surface, (x + offset[0], y + offset[1])))
+                x += strideX
+        win.blits(blits, doreturn=False)
+
+    @staticmethod
+    def _cellArea(left, top, width, height):  # the pixels of a cell, whole numbers give the same rect back
+        x = math.floor(left)
+        y = math.floor(top)
+        return x, y, math.floor(left + width) - x, math.floor(top + height) - y
+
+    def _rangesInArea(self, area):  # the rows and columns of the cells overlapping area
+        strideX = self.cellWidth + self.gapX
+        strideY = self.cellHeight + self.gapY
+        firstRow = max(0, int((area.top - self.gridRect.top - self.gapY) // strideY))
+        lastRow = min(self.yCellNum - 1, int((area.bottom - 1 - self.gridRect.top - self.gapY) // strideY))
+        firstColumn = max(0, int((area.left - self.gridRect.left - self.gapX) // strideX))
+        lastColumn = min(self.xCellNum - 1, int((area.right - 1 - self.gridRect.left - self.gapX) // strideX))
+        return range(firstRow, max(firstRow, lastRow + 1)), range(firstColumn, max(firstColumn, lastColumn + 1))
+
+    def _drawView(self, win, area):  # the cells seen through the part of the viewport in area
+        viewport = self.viewport
+        area = viewport.viewRect.clip(area)
+        if area.width <= 0 or area.height <= 0:
+            return
+        clip = win.get_clip()
+        win.set_clip(area.clip(clip))
+        win.fill(self.boxBackgroundColor, area)
+        zoom = viewport.zoom
+        left, top = viewport.toViewPoint((self.gridRect.left + self.gapX, self.gridRect.top + self.gapY))
+        geometry = (left, top, (self.cellWidth + self.gapX) * zoom, (self.cellHeight + self.gapY) * zoom,
+                    self.cellWidth * zoom, self.cellHeight * zoom, viewport.scaleFont(self.font))
+        self._drawCells(win, *self._rangesInArea(viewport.toContentRect(area)), geometry=geometry)
+        win.set_clip(clip)
+
+    def draw(self, win):
+        if not self.visible:
+            return
+        if self.viewport is not None:
+            self._drawView(win, self.viewport.viewRect)
+            return
+        win.fill(rect=self.gridRect, color=self.boxBackgroundColor)
+        self._drawCells(win, range(self.yCellNum), range(self.xCellNum))
+
+    def drawArea(self, win, area):
+        if not self.visible:
+            return
+        if self.viewport is not None:
+            self._drawView(win, area)
+            return
+        win.fill(rect=self.gridRect.clip(area), color=self.boxBackgroundColor)
+        self._drawCells(win, *self._rangesInArea(area))
 
 
 ########################################################################################################################
@@ -428,7 +983,7 @@ class CrossOutWordGrid(WordGrid):
     # a WordGrid class that also supports crossing out words
     def __init__(self, gridRect, listOfWords, xCellNum, yCellNum, cellWidth, cellHeight,
                  centerX=True, centerY=True, borderColor=Colors.BLACK, boxBackgroundColor=None,
-                 fillBoxesWithColor=True, centerTextInBox=True, font=pygame.font.SysFont("arial", 12),
+                 fillBoxesWithColor=True, centerTextInBox=True, font=Fonts.get("arial", 12),
                  drawBoxesAroundWords=True, drawGridBorder=True, visible=True):
 
         super().__init__(gridRect, listOfWords, xCellNum, yCellNum, cellWidth, cellHeight, centerX, centerY,
@@ -436,14 +991,28 @@ class CrossOutWordGrid(WordGrid):
                          drawBoxesAroundWords, drawGridBorder, visible)
         # list with the line arguments
         self.lineList = list()
+        self._crossedOutBoxes = dict()  # WordBox -> index in lineList of its strike-through
+        self._syncedWordCount = 0  # how much of the found word list crossOut() has gone through
 
     def crossOut(self, wordSet):
-        if len(wordSet) == len(self.lineList):
+        # crosses out every word added to the list since the last call, the list is only ever appended to
+        if len(wordSet) == self._syncedWordCount:
             # no new change
             return
+        for word in wordSet[self._syncedWordCount:]:
+            self.crossOutWord(word)
+        self._syncedWordCount = len(wordSet)
 
-        word = wordSet[-1]
+    def crossOutWord(self, word):
         wordBox = self.getWordBoxWithWord(word)
+        if wordBox is None or wordBox in self._crossedOutBoxes:
+            return
+        # append args
+        self._crossedOutBoxes[wordBox] = len(self.lineList)
+        self.lineList.append(self._getStrikeThrough(wordBox))
+        wordBox.markDirty()
+
+    def _getStrikeThrough(self, wordBox):  # the line arguments crossing out the text of a box
         width = wordBox.textBlit.get_width()
         height = wordBox.textBlit.get_height()
         pos = wordBox.textPosition
@@ -451,10 +1020,129 @@ class CrossOutWordGrid(WordGrid):
         lineStart = (pos[0], pos[1] + height // 2 - 1)
         #           x of start plus width,   y of start
         lineEnd = (lineStart[0] + width, lineStart[1])
-        # append args
-        self.lineList.append((Colors.BLACK, lineStart, lineEnd, 3))
+        return Colors.BLACK, lineStart, lineEnd, 3
+
+    def moveCell(self, cell, left, top):
+        super().moveCell(cell, left, top)
+        lineInd = self._crossedOutBoxes.get(cell)
+        if lineInd is not None:  # the line moves with the text
+            self.lineList[lineInd] = self._getStrikeThrough(cell)
 
     def draw(self, win):
         super().draw(win)
         for lineArgs in self.lineList:
             pygame.draw.line(win, *lineArgs)
+
+    def drawArea(self, win, area):
+        super().drawArea(win, area)
+        for wordBox in self.cellsInArea(area):  # the lines stay inside the text of their box
+            lineInd = self._crossedOutBoxes.get(wordBox)
+            if lineInd is not None:
+                pygame.draw.line(win, *self.lineList[lineInd])
+
+
+########################################################################################################################
+########################################################################################################################
+
+
+class Viewport:
+    # the part of a grid shown in viewRect, for grids bigger than the space they get
+    # the grid keeps its cells where gridRect puts them, the viewport maps those content positions to the window:
+    #   window position = viewRect.topleft + (content position - contentRect.topleft - scroll) * zoom
+    # scrolling and zooming only change the mapping, nothing in the grid moves, so a selection stays when its squares
+    # go out of view
+    # minZoom: how far it zooms out, until the whole content fits when not given. maxZoom: how far it zooms in
+    def __init__(self, viewRect, contentRect, minZoom=None, maxZoom=4):
+        self.viewRect = pygame.Rect(viewRect)
+        self.contentRect = contentRect
+        self.minZoom = minZoom
+        self.maxZoom = maxZoom
+        self.zoom = 1
+        self.scrollX = 0  # content pixels left of the view
+        self.scrollY = 0  # content pixels above the view
+        self.changed = True  # the mapping changed since toViewRects() was last called, the whole view gets redrawn
+        self._fonts = dict()  # font -> the font at the current zoom
+
+    def setContentRect(self, contentRect):  # for a grid that grew
+        self.contentRect = contentRect
+        self.scrollTo(self.scrollX, self.scrollY)
+        self.changed = True
+
+    def getMinZoom(self):
+        if self.minZoom is not None:
+            return self.minZoom
+        return min(1, self.viewRect.width / max(1, self.contentRect.width),
+                   self.viewRect.height / max(1, self.contentRect.height))
+
+    # mapping
+
+    def toContent(self, pos):  # the content position shown at a window position
+        return (math.floor((pos[0] - self.viewRect.left) / self.zoom + self.contentRect.left + self.scrollX),
+                math.floor((pos[1] - self.viewRect.top) / self.zoom + self.contentRect.top + self.scrollY))
+
+    def toContentRect(self, rect):  # the content area shown in a window area
+        left, top = self.toContent(rect.topleft)
+        right, bottom = self.toContent(rect.bottomright)
+        return pygame.Rect(left, top, right - left + 1, bottom - top + 1)
+
+    def toViewPoint(self, pos):  # the window position of a content position, in fractions of a pixel
+        return (self.viewRect.left + (pos[0] - self.contentRect.left - self.scrollX) * self.zoom,
+                self.viewRect.top + (pos[1] - self.contentRect.top - self.scrollY) * self.zoom)
+
+    def toView(self, rect):
+        # the window area of a content area, areas sharing an edge in the content still share it in the window
+        left, top = self.toViewPoint(rect.topleft)
+        right, bottom = self.toViewPoint(rect.bottomright)
+        left, top = math.floor(left), math.floor(top)
+        return pygame.Rect(left, top, math.floor(right) - left, math.floor(bottom) - top)
+
+    def toViewRects(self, rects):
+        # content areas that changed as the window areas to redraw, clipped to the view
+        # the whole view after a scroll or zoom
+        if self.changed:
+            self.changed = False
+            return [self.viewRect]
+        viewRects = []
+        for rect in rects:
+            rect = self.toView(rect).clip(self.viewRect)
+            if rect.width > 0 and rect.height > 0:
+                viewRects.append(rect)
+        return viewRects
+
+    def scaleFont(self, font):  # the font at the current zoom, fonts not made by Fonts.get() stay as they are
+        scaledFont = self._fonts.get(font)
+        if scaledFont is None:
+            spec = Fonts.getSpec(font)
+            if spec is None or self.zoom == 1:
+                scaledFont = font
+            else:
+                family, size, bold, italic = spec
+                scaledFont = Fonts.get(family, max(1, round(size * self.zoom)), bold, italic)
+            self._fonts[font] = scaledFont
+        return scaledFont
+
+    # moving
+
+    def scrollTo(self, x, y):  # content pixels between the content's and the view's top left, kept inside the content
+        x = min(max(0, x), max(0, self.contentRect.width - self.viewRect.width / self.zoom))
+        y = min(max(0, y), max(0, self.contentRect.height - self.viewRect.height / self.zoom))
+        if (x, y) != (self.scrollX, self.scrollY):
+            self.scrollX, self.scrollY = x, y
+            self.changed = True
+
+    def scrollBy(self, dx, dy):  # dx and dy in window pixels
+        self.scrollTo(self.scrollX + dx / self.zoom, self.scrollY + dy / self.zoom)
+
+    def zoomAt(self, pos, factor):
+        # multiplies the zoom by factor, the content under the window position pos stays there
+        zoom = min(max(self.getMinZoom(), self.zoom * factor), self.maxZoom)
+        if zoom == self.zoom:
+            return
+        offsetX = pos[0] - self.viewRect.left
+        offsetY = pos[1] - self.viewRect.top
+        contentX = self.scrollX + offsetX / self.zoom
+        contentY = self.scrollY + offsetY / self.zoom
+        self.zoom = zoom
+        self._fonts.clear()
+        self.changed = True
+        self.scrollTo(contentX - offsetX / zoom, contentY - offsetY / zoom)
@@ -0,0 +1,187 @@
+# File name: LayoutCache.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class LayoutCache: compiled puzzle screens kept on disk, so a puzzle opens without layout or text rendering
+# Date: October 17th, 2026
+
+import hashlib
+import json
+import os
+import struct
+import pygame
+from Fonts import Fonts
+from TextCache import textCache
+
+# file layout, numbers little endian: magic, version, length of the json part, the json part in utf-8,
+# then the pixels of every text surface one after the other, 4 bytes per pixel in RGBA
+MAGIC = b"WSLC"
+VERSION = 2  # 2: layouts have a viewRect
+HEADER = struct.Struct("<4sHI")
+EXTENSION = ".wslayout"
+
+
+class LayoutCache:
+    # what Game.startPuzzle works out before a puzzle's first frame: the layout, the answer key and every text
+    # rendered for it. Files are named after a hash of the puzzle's content, the logical screen size, the settings
+    # the layout depends on and the pygame version, a changed puzzle, size or setting gets a file of its own.
+    # The fonts' files are checked when a file is read, a file made with other fonts is ignored and made again
+    # settings: anything json can hold that changes how the game lays a puzzle out, see Game.getLayoutSettings()
+    # maxFiles: the least recently used files are deleted past this many
+    def __init__(self, directory=".layoutcache", maxFiles=256):
+        self.directory = directory
+        self.maxFiles = maxFiles
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def getKey(puzzleData, logicalSize, settings=()):
+        content = json.dumps([VERSION, pygame.version.ver, list(logicalSize), settings, puzzleData.title,
+                              puzzleData.rowCount, puzzleData.columnCount, "".join(puzzleData.letters),
+                              puzzleData.words])
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def getPath(self, puzzleData, logicalSize, settings=()):
+        return os.path.join(self.directory, self.getKey(puzzleData, logicalSize, settings) + EXTENSION)
+
+    # values in the layout, json has no rects or fonts
+
+    @staticmethod
+    def _encodeValue(value):
+        if isinstance(value, pygame.Rect):
+            return {"rect": [value.left, value.top, value.width, value.height]}
+        if isinstance(value, pygame.font.Font):
+            spec = Fonts.getSpec(value)
+            if spec is None:
+                raise ValueError("only fonts made by Fonts.get() can be stored")
+            return {"font": list(spec)}
+        return value
+
+    @staticmethod
+    def _decodeValue(value):
+        if isinstance(value, dict) and "rect" in value:
+            return pygame.Rect(value["rect"])
+        if isinstance(value, dict) and "font" in value:
+            return Fonts.get(*value["font"])
+        return value
+
+    # reading and writing
+
+    def load(self, puzzleData, logicalSize, settings=()):
+        # returns (layout, answer key) and puts the stored texts in textCache, None when there is no usable file
+        path = self.getPath(puzzleData, logicalSize, settings)
+        try:
+            with open(path, 'rb') as fi:
+                data = fi.read()
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            compiled = self._parse(data)
+        except (ValueError, KeyError, TypeError, IndexError, struct.error, pygame.error):
+            compiled = None
+            self._remove(path)  # cut short or damaged, it is made again
+        if compiled is None:
+            self.misses += 1
+            return None
+        layout, answerKey, texts = compiled
+        for entry in texts:  # only once the whole file was read, a damaged file puts nothing in textCache
+            textCache.add(*entry)
+        try:
+            os.utime(path)  # recently used
+        except OSError:
+            pass
+        self.hits += 1
+        return layout, answerKey
+
+    def _parse(self, data):
+        # (layout, answer key, arguments of textCache.add for every text) from a file's content, None when it was
+        # made with other fonts, raises when the file is damaged
+        magic, version, jsonLength = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError("not a layout cache file")
+        if HEADER.size + jsonLength > len(data):
+            raise ValueError("cut short")
+        stored = json.loads(data[HEADER.size:HEADER.size + jsonLength].decode("utf-8"))
+        for family, bold, italic, signature in stored["fonts"]:
+            if Fonts.getSignature(family, bold, italic) != signature:
+                return None  # a font file changed, the texts would look different
+
+        pixels = data[HEADER.size + jsonLength:]
+        texts = []
+        for fontSpec, text, color, antialias, size, surfaceSize, offset in stored["texts"]:
+            length = surfaceSize[0] * surfaceSize[1] * 4
+            if length == 0:  # an empty text, frombuffer refuses empty surfaces
+                surface = pygame.Surface(surfaceSize, pygame.SRCALPHA)
+            else:
+                surface = pygame.image.frombuffer(pixels[offset:offset + length], surfaceSize, "RGBA").copy()
+            texts.append((Fonts.get(*fontSpec), text, color, surface, size, antialias))
+        layout = {name: self._decodeValue(value) for name, value in stored["layout"].items()}
+        answerKey = dict()
+        for startRow, startColumn, endRow, endColumn, word in stored["answerKey"]:
+            answerKey[((startRow, startColumn), (endRow, endColumn))] = word
+        return layout, answerKey, texts
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def store(self, puzzleData, logicalSize, layout, answerKey, textEntries, settings=()):
+        # textEntries: (font, text, color, antialias, surface, size) as TextSurfaceCache.stopRecording() gives them
+        # texts in fonts not made by Fonts.get() are left out
+        # returns False when the file can't be written, in a read only directory or on a full disk, the game goes on
+        # without it
+        fontStyles = set()
+        texts = []
+        pixels = bytearray()
+        for font, text, color, antialias, surface, size in textEntries:
+            fontSpec = Fonts.getSpec(font)
+            if fontSpec is None:
+                continue
+            fontStyles.add((fontSpec[0], fontSpec[2], fontSpec[3]))
+            texts.append([list(fontSpec), text, list(color), antialias, list(size), list(surface.get_size()),
+                          len(pixels)])
+            pixels += pygame.image.tobytes(surface, "RGBA")
+        for value in layout.values():
+            if isinstance(value, pygame.font.Font):
+                fontSpec = Fonts.getSpec(value)
+                fontStyles.add((fontSpec[0], fontSpec[2], fontSpec[3]))
+
+        stored = {"layout": {name: self._encodeValue(value) for name, value in layout.items()},
+                  "answerKey": [[start[0], start[1], end[0], end[1], word] for (start, end), word in answerKey.items()],
+                  "fonts": [[family, bold, italic, Fonts.getSignature(family, bold, italic)]
+                            for family, bold, italic in sorted(fontStyles)],
+                  "texts": texts}
+        jsonBytes = json.dumps(stored).encode("utf-8")
+
+        path = self.getPath(puzzleData, logicalSize, settings)
+        temporaryPath = path + ".tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temporaryPath, 'wb') as fo:
+                fo.write(HEADER.pack(MAGIC, VERSION, len(jsonBytes)))
+                fo.write(jsonBytes)
+                fo.write(pixels)
+            os.replace(temporaryPath, path)  # a game reading it never sees half a file
+            self._prune()
+        except OSError:
+            self._remove(temporaryPath)
+            return False
+        return True
+
+    def _prune(self):
+        paths = [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(EXTENSION)]
+        if len(paths) <= self.maxFiles:
+            return
+        paths.sort(key=os.path.getmtime)
+        for path in paths[:len(paths) - self.maxFiles]:
+            os.remove(path)
+
+    def clear(self):
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            if name.endswith(EXTENSION):
+                os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,119 @@
+# File name: LetterMatrix.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class LetterMatrix: the letters of a puzzle and the state of every cell, stored in numpy arrays
+# Date: October 17th, 2026
+
+try:
+    import numpy
+except ImportError:  # only needed for large puzzles, the rest of the game runs without it
+    numpy = None
+
+
+class LetterMatrix:
+    # array-backed model of a word search grid, one small number per cell instead of a Button per cell
+    #   letters:   letter codes, uint8 for ascii puzzles, uint32 code points otherwise
+    #   found:     True for cells that are part of a found word
+    #   highlight: True for cells in the current selection
+    #   colorIds:  index into palette of the color a found cell is drawn with, 0 for none
+    # coordinates are (row, column) like in WordSearchGrid
+    def __init__(self, rowCount, columnCount, letterCodes):
+        if numpy is None:
+            raise ImportError("LetterMatrix needs numpy, install it with 'pip install numpy'")
+        self.rowCount = rowCount
+        self.columnCount = columnCount
+        self.letters = letterCodes.reshape(rowCount, columnCount)
+        self.found = numpy.zeros((rowCount, columnCount), dtype=bool)
+        self.highlight = numpy.zeros((rowCount, columnCount), dtype=bool)
+        self._highlighted = None  # indices of the highlighted cells
+        self.colorIds = numpy.zeros((rowCount, columnCount), dtype=numpy.uint16)
+        self.palette = [None]  # colorId -> color, 0 means not colored
+
+    @staticmethod
+    def isAvailable():
+        return numpy is not None
+
+    @classmethod
+    def fromLetters(cls, rowCount, columnCount, letters):
+        # letters: one letter per cell, row after row, as a list of strings or a single string
+        text = "".join(letters)
+        if len(text) != rowCount * columnCount:
+            raise ValueError("got %d letters for a %dx%d grid" % (len(text), columnCount, rowCount))
+        if text.isascii():
+            codes = numpy.frombuffer(text.encode("ascii"), dtype=numpy.uint8).copy()
+        else:
+            codes = numpy.array([ord(letter) for letter in text], dtype=numpy.uint32)
+        return cls(rowCount, columnCount, codes)
+
+    @classmethod
+    def fromBytes(cls, rowCount, columnCount, data):
+        # data: one ascii byte per cell, row after row, eg. from a memory-mapped file
+        return cls(rowCount, columnCount, numpy.frombuffer(data, dtype=numpy.uint8, count=rowCount * columnCount))
+
+    @classmethod
+    def fromPuzzleData(cls, puzzleData):
+        return cls.fromLetters(puzzleData.rowCount, puzzleData.columnCount, puzzleData.letters)
+
+    # reading letters
+
+    def _toText(self, codes):
+        if codes.dtype == numpy.uint8:
+            return codes.tobytes().decode("ascii")
+        return "".join(map(chr, codes.tolist()))
+
+    def text(self):  # every letter, row after row
+        return self._toText(self.letters.ravel())
+
+    def getLetter(self, rowInd, columnInd):
+        return chr(self.letters[rowInd, columnInd])
+
+    def row(self, rowInd):
+        return self._toText(self.letters[rowInd])
+
+    def column(self, columnInd):
+        return self._toText(self.letters[:, columnInd])
+
+    def diagonal(self, offset=0):  # down and right, offset > 0 starts in a later column
+        return self._toText(numpy.diagonal(self.letters, offset))
+
+    def antiDiagonal(self, offset=0):  # down and left, offset > 0 starts in an earlier column from the right
+        return self._toText(numpy.diagonal(self.letters[:, ::-1], offset))
+
+    @staticmethod
+    def lineIndices(start, end):
+        # rows and columns of the cells from start to end, which have to share a row, column or diagonal
+        length = max(abs(end[0] - start[0]), abs(end[1] - start[1])) + 1
+        rows = start[0] + numpy.sign(end[0] - start[0]) * numpy.arange(length)
+        columns = start[1] + numpy.sign(end[1] - start[1]) * numpy.arange(length)
+        return rows, columns
+
+    def selectionText(self, start, end):
+        return self._toText(self.letters[self.lineIndices(start, end)])
+
+    # cell state
+
+    def setHighlight(self, start, end):
+        # only the cells of the previous selection get cleared, not the whole matrix
+        if self._highlighted is not None:
+            self.highlight[self._highlighted] = False
+            self._highlighted = None
+        if start is not None:
+            self._highlighted = self.lineIndices(start, start if end is None else end)
+            self.highlight[self._highlighted] = True
+
+    def addColor(self, color):
+        self.palette.append(color)
+        return len(self.palette) - 1
+
+    def markFound(self, start, end, colorId):
+        # cells already part of a found word keep their color, like WordSearchGrid does
+        indices = self.lineIndices(start, end)
+        newCells = ~self.found[indices]
+        self.colorIds[indices[0][newCells], indices[1][newCells]] = colorId
+        self.found[indices] = True
+
+    def foundMask(self):
+        return self.found
+
+    def getColorOfCell(self, rowInd, columnInd):
+        return self.palette[self.colorIds[rowInd, columnInd]]
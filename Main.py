@@ -7,39 +7,40 @@
 import pygame
 pygame.init()
 from Game import *
-
-class PuzzleData:
-
-    def __init__(self, title, rowCount, columnCount, letters, words):
-
-        self.title = title
-        self.rowCount = rowCount
-        self.columnCount = columnCount
-        self.letters = letters
-        self.words = words
-
-
-
-fi = open("puzzles.txt", 'r')
-
-puzzleDataDict = dict()
-amountOfPuzzles = int(fi.readline().strip())
-
-
-for puzzle in range(amountOfPuzzles):
-    title = fi.readline().strip()
-
-    columnCount = int(fi.readline().strip())
-    rowCount = int(fi.readline().strip())
-    letters = []
-    for row in range(rowCount):
-        letters += fi.readline().strip().split(' ')
-    words = []
-    wordCount = int(fi.readline().strip())
-    for word in range(wordCount):
-        words.append(fi.readline().strip())
-    puzzleDataDict[title]= PuzzleData(title=title, rowCount=rowCount, columnCount=columnCount, letters=letters, words=words)
-
-
-game = Game(puzzleDataDict)
+import os
+from PuzzleData import iterPuzzleFile
+from PuzzleLibrary import PuzzleLibrary
+from FrameProfiler import FrameProfiler
+from EventTrace import EventRecorder
+from LayoutCache import LayoutCache
+
+
+if os.path.exists("puzzles.wslib") and (not os.path.exists("puzzles.txt")
+                                       or os.path.getmtime("puzzles.wslib") >= os.path.getmtime("puzzles.txt")):
+    # converted with PuzzleLibrary.py or made by PuzzlePack.py, puzzles are only read once they are played
+    puzzleDataDict = PuzzleLibrary("puzzles.wslib")
+else:
+    puzzleDataDict = dict()
+    parseErrors = []  # malformed puzzles are left out of the menu
+    for puzzleData in iterPuzzleFile("puzzles.txt", skipMalformed=True, errors=parseErrors):
+        puzzleDataDict[puzzleData.title] = puzzleData
+    for error in parseErrors:
+        print("puzzles.txt, " + str(error))
+
+
+# WORDSEARCH_PROFILE=frames.csv (or .jsonl) times every frame and writes it to that file, =1 only shows the overlay
+profilePath = os.environ.get("WORDSEARCH_PROFILE")
+profiler = None
+if profilePath:
+    profiler = FrameProfiler(exportPath=None if profilePath == "1" else profilePath)
+
+# WORDSEARCH_RECORD=session.wstrace writes the game's input to that file, python EventTrace.py session.wstrace replays it
+recordPath = os.environ.get("WORDSEARCH_RECORD")
+recorder = None
+if recordPath:
+    recorder = EventRecorder(recordPath)
+
+game = Game(puzzleDataDict, profiler=profiler, resizable=True, scheduler=recorder, layoutCache=LayoutCache())
 game.start()
+if recorder is not None:
+    recorder.close()
@@ -0,0 +1,178 @@
+# File name: PuzzleData.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class PuzzleData: the title, size, letters and words of one puzzle
+#       class PuzzleFormatError: a problem in a puzzles.txt file and the line it is on
+#       iterPuzzles(), iterPuzzleFile(), readPuzzleFile(): read and check puzzles.txt files one puzzle at a time
+#       formatPuzzle(), formatPuzzleFile(): write puzzles in the puzzles.txt format
+# Date: April 9th, 2019
+
+from collections import deque
+
+
+class PuzzleData:
+
+    def __init__(self, title, rowCount, columnCount, letters, words):
+
+        self.title = title
+        self.rowCount = rowCount
+        self.columnCount = columnCount
+        self.letters = letters  # one letter per cell, row after row, a list of letters or one string
+        self.words = words
+
+
+class PuzzleFormatError(ValueError):
+    # a problem in a puzzles.txt file, lineNumber counts from 1
+    def __init__(self, message, lineNumber, title=None):
+        if title is not None:
+            message = "%s: %s" % (title, message)
+        super().__init__("line %d: %s" % (lineNumber, message))
+        self.lineNumber = lineNumber
+        self.title = title
+
+
+class _LineReader:
+    # the numbered, non-blank lines of a file, with lookahead, blank lines never shift anything
+    def __init__(self, lines):
+        self._lines = enumerate(lines, 1)
+        self._pending = deque()
+        self.lastLineNumber = 0
+
+    def peek(self, ahead=0):  # (lineNumber, text), None at the end of the file
+        while len(self._pending) <= ahead:
+            for lineNumber, line in self._lines:
+                self.lastLineNumber = lineNumber
+                line = line.strip()
+                if line:
+                    self._pending.append((lineNumber, line))
+                    break
+            else:
+                return None
+        return self._pending[ahead]
+
+    def next(self, expected, title=None):
+        line = self.peek()
+        if line is None:
+            raise PuzzleFormatError("file ends where %s was expected" % expected, self.lastLineNumber + 1, title)
+        return self._pending.popleft()
+
+    def pushBack(self, line):  # a line that turned out not to belong where it was read, it may start the next puzzle
+        self._pending.appendleft(line)
+
+    def nextInt(self, expected, title=None):
+        lineNumber, text = self.next(expected, title)
+        if not text.isdigit():
+            self.pushBack((lineNumber, text))
+            raise PuzzleFormatError("expected %s, got %r" % (expected, text), lineNumber, title)
+        return int(text)
+
+
+def _isInt(line):
+    return line is not None and line[1].isdigit()
+
+
+def _parsePuzzle(reader):
+    lineNumber, title = reader.next("a puzzle title")
+    if title.isdigit():
+        raise PuzzleFormatError("expected a puzzle title, got %r" % title, lineNumber)
+    columnCount = reader.nextInt("the column count", title)
+    rowCount = reader.nextInt("the row count", title)
+    letters = []  # every row is checked to have columnCount letters, so there are columnCount * rowCount
+    for row in range(rowCount):
+        lineNumber, text = reader.next("row %d of %d" % (row + 1, rowCount), title)
+        rowLetters = text.split()
+        if len(rowLetters) != columnCount:
+            reader.pushBack((lineNumber, text))
+            raise PuzzleFormatError("row %d has %d letters, expected %d" % (row + 1, len(rowLetters), columnCount),
+                                    lineNumber, title)
+        for letter in rowLetters:
+            if len(letter) != 1:
+                raise PuzzleFormatError("%r in row %d is not a single letter" % (letter, row + 1), lineNumber, title)
+        letters += rowLetters
+
+    wordCount = reader.nextInt("the word count", title)
+    words = []
+    for word in range(wordCount):
+        lineNumber, text = reader.next("word %d of %d" % (word + 1, wordCount), title)
+        if len(text.split()) != 1 or text.isdigit():
+            reader.pushBack((lineNumber, text))
+            raise PuzzleFormatError("%r is not a single word, is the word count right?" % text, lineNumber, title)
+        if _isInt(reader.peek()) and _isInt(reader.peek(1)):
+            # a title followed by the column and row counts, the next puzzle starts here and not a word
+            reader.pushBack((lineNumber, text))
+            raise PuzzleFormatError("expected word %d of %d, got the start of puzzle %r, is the word count right?"
+                                    % (word + 1, wordCount, text), lineNumber, title)
+        words.append(text)
+    return PuzzleData(title=title, rowCount=rowCount, columnCount=columnCount, letters=letters, words=words)
+
+
+def _skipToNextPuzzle(reader):
+    # a puzzle starts with a title followed by the column and row counts
+    while reader.peek() is not None:
+        if not _isInt(reader.peek()) and _isInt(reader.peek(1)) and _isInt(reader.peek(2)):
+            return
+        reader.next("")
+
+
+def iterPuzzles(lines, skipMalformed=False, errors=None):
+    # yields the puzzles of a puzzles.txt file one at a time, lines can be an open file or any iterable of lines
+    # every count is checked against what follows it, problems raise a PuzzleFormatError with the line number
+    # with skipMalformed a bad puzzle is skipped instead, and the error added to errors if it is a list
+    reader = _LineReader(lines)
+    declaredCount = None
+    try:
+        declaredCount = reader.nextInt("the amount of puzzles")
+    except PuzzleFormatError as error:
+        if not skipMalformed:
+            raise
+        if errors is not None:
+            errors.append(error)
+
+    puzzleCount = 0
+    while reader.peek() is not None:
+        try:
+            puzzleData = _parsePuzzle(reader)
+        except PuzzleFormatError as error:
+            if not skipMalformed:
+                raise
+            if errors is not None:
+                errors.append(error)
+            puzzleCount += 1
+            _skipToNextPuzzle(reader)
+            continue
+        puzzleCount += 1
+        yield puzzleData
+
+    if declaredCount is not None and puzzleCount != declaredCount:
+        error = PuzzleFormatError("the file declares %d puzzles but contains %d" % (declaredCount, puzzleCount), 1)
+        if not skipMalformed:
+            raise error
+        if errors is not None:
+            errors.append(error)
+
+
+def iterPuzzleFile(path, skipMalformed=False, errors=None):
+    with open(path, 'r') as fi:
+        for puzzleData in iterPuzzles(fi, skipMalformed, errors):
+            yield puzzleData
+
+
+def readPuzzleFile(path, skipMalformed=False, errors=None):
+    return list(iterPuzzleFile(path, skipMalformed, errors))
+
+
+def formatPuzzle(puzzleData):
+    # the lines of one puzzle as they appear in puzzles.txt
+    lines = [puzzleData.title, str(puzzleData.columnCount), str(puzzleData.rowCount)]
+    for rowInd in range(puzzleData.rowCount):
+        start = rowInd * puzzleData.columnCount
+        lines.append(" ".join(puzzleData.letters[start:start + puzzleData.columnCount]))
+    lines.append(str(len(puzzleData.words)))
+    lines += puzzleData.words
+    return "\n".join(lines) + "\n"
+
+
+def formatPuzzleFile(puzzles):
+    # a whole puzzles.txt, the amount of puzzles followed by each puzzle
+    puzzles = list(puzzles)
+    return str(len(puzzles)) + "\n" + "".join(formatPuzzle(puzzleData) for puzzleData in puzzles)
@@ -0,0 +1,181 @@
+# File name: PuzzleGenerator.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class PuzzleGenerator: builds word search puzzles from a title, a size and a list of words
+# Date: October 17th, 2026
+
+import random
+import string
+from PuzzleData import PuzzleData, formatPuzzle
+from Solver import WordSearchSolver
+
+
+class PuzzleGenerator:
+    # places every word in one of the eight directions PuzzleSession.inAllowedDirection accepts,
+    # then fills the remaining cells with random letters, rolled again where they spell a word a second time
+    # words are placed longest first, each one tries a random sample of placements, preferring the ones crossing
+    # the most letters already in the grid, and when a word fits nowhere the previous word is moved (backtracking)
+    # the same seed always gives the same puzzle
+
+    # (row step, column step): right, left, down, up and the four diagonals
+    DIRECTIONS = ((0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1))
+
+    def __init__(self, seed=None, directions=DIRECTIONS, fillLetters=string.ascii_uppercase, placementsPerWord=60,
+                 maxBacktracks=5000, maxFillRounds=50):
+        self.random = random.Random(seed)
+        self.directions = directions
+        self.fillLetters = fillLetters
+        self.placementsPerWord = placementsPerWord  # size of the random sample of placements tried per word
+        self.maxBacktracks = maxBacktracks
+        self.maxFillRounds = maxFillRounds  # times the fill letters of words found twice are rolled again
+        self.lastPlacements = dict()  # word -> ((startRow, startColumn), (endRow, endColumn)) of the last puzzle
+
+    def generate(self, title, rowCount, columnCount, words, seed=None):
+        # returns a PuzzleData where every word appears exactly once
+        # raises ValueError when the words can't all be placed, or the fill letters keep spelling a word again
+        rng = self.random if seed is None else random.Random(seed)
+        words = list(words)
+        self._checkWords(rowCount, columnCount, words)
+
+        grid = [None] * (rowCount * columnCount)  # row after row, like PuzzleData.letters
+        placements = self._placeWords(rng, grid, rowCount, columnCount, words)
+        fillIndices = [index for index in range(len(grid)) if grid[index] is None]
+        for index in fillIndices:
+            grid[index] = rng.choice(self.fillLetters)
+        self._removeExtraOccurrences(rng, grid, rowCount, columnCount, placements, set(fillIndices))
+
+        self.lastPlacements = dict()
+        for word, (start, step) in placements.items():
+            end = start + step * (len(word) - 1)
+            self.lastPlacements[word] = (divmod(start, columnCount), divmod(end, columnCount))
+        return PuzzleData(title=title, rowCount=rowCount, columnCount=columnCount, letters=grid, words=words)
+
+    def generateText(self, title, rowCount, columnCount, words, seed=None):
+        # the puzzle in the puzzles.txt format
+        return formatPuzzle(self.generate(title, rowCount, columnCount, words, seed))
+
+    @staticmethod
+    def isNested(word, otherWord):
+        # whether placing otherWord always spells word too, as CAT in CATS or TAC in CATS read backwards
+        return word != otherWord and (word in otherWord or word[::-1] in otherWord)
+
+    @classmethod
+    def _checkWords(cls, rowCount, columnCount, words):
+        if rowCount <= 0 or columnCount <= 0:
+            raise ValueError("a puzzle needs at least one row and one column")
+        if len(set(words)) != len(words):
+            raise ValueError("the word list contains the same word twice")
+        for word in words:
+            if not word or not word.isalpha():
+                raise ValueError("words can only contain letters: %r" % word)
+            if len(word) > max(rowCount, columnCount):
+                raise ValueError("%s does not fit in a %dx%d grid" % (word, columnCount, rowCount))
+        for word in words:
+            for otherWord in words:
+                if cls.isNested(word, otherWord):
+                    raise ValueError("%s is part of %s, it would be in the grid twice" % (word, otherWord))
+
+    def _removeExtraOccurrences(self, rng, grid, rowCount, columnCount, placements, fillIndices):
+        # rolls the fill letters of every place a word is spelled besides where it was placed again, until there
+        # are none, raises ValueError when the placed words themselves spell one or the rounds run out
+        solver = WordSearchSolver(list(placements))
+        for fillRound in range(self.maxFillRounds + 1):
+            rerolled = set()
+            for word, occurrences in solver.findAll(grid, rowCount, columnCount).items():
+                start, step = placements[word]
+                placedEnds = {start, start + step * (len(word) - 1)}
+                for occurrenceStart, occurrenceEnd in occurrences:
+                    first = occurrenceStart[0] * columnCount + occurrenceStart[1]
+                    last = occurrenceEnd[0] * columnCount + occurrenceEnd[1]
+                    if {first, last} == placedEnds:
+                        continue
+                    indices = self._lineIndices(first, last, columnCount)
+                    extraFillIndices = [index for index in indices if index in fillIndices]
+                    if not extraFillIndices:
+                        raise ValueError("the placed words spell %s a second time" % word)
+                    rerolled.update(extraFillIndices)
+            if not rerolled:
+                return
+            if fillRound == self.maxFillRounds:
+                break
+            for index in sorted(rerolled):  # in grid order, the same seed rolls the same letters
+                grid[index] = rng.choice(self.fillLetters)
+        raise ValueError("the fill letters kept spelling words a second time")
+
+    @staticmethod
+    def _lineIndices(first, last, columnCount):  # the grid indices from first to last along a row, column or diagonal
+        rowDelta = last // columnCount - first // columnCount
+        columnDelta = last % columnCount - first % columnCount
+        length = max(abs(rowDelta), abs(columnDelta)) + 1
+        if length == 1:
+            return [first]
+        step = (rowDelta // (length - 1)) * columnCount + columnDelta // (length - 1)
+        return [first + step * ind for ind in range(length)]
+
+    def _placeWords(self, rng, grid, rowCount, columnCount, words):
+        # returns word -> (start index, index step), the grid is left with only the placed words' letters
+        order = sorted(words, key=len, reverse=True)  # long words are the hardest to fit, place them first
+        stack = []  # (untried placements, placement, grid indices the word wrote to), one per placed word
+        placements = self._findPlacements(rng, grid, rowCount, columnCount, order[0]) if order else []
+        backtracks = 0
+        while len(stack) < len(order):
+            if placements:
+                start, step = placements.pop()  # the sample is sorted so the last one crosses the most letters
+                word = order[len(stack)]
+                newIndices = []
+                index = start
+                for letter in word:
+                    if grid[index] is None:
+                        grid[index] = letter
+                        newIndices.append(index)
+                    index += step
+                stack.append((placements, (start, step), newIndices))
+                if len(stack) < len(order):
+                    placements = self._findPlacements(rng, grid, rowCount, columnCount, order[len(stack)])
+            else:
+                # no room for the next word, move the previous one
+                if not stack or backtracks >= self.maxBacktracks:
+                    raise ValueError("could not fit %s in a %dx%d grid" % (order[len(stack)], columnCount, rowCount))
+                backtracks += 1
+                placements, placement, newIndices = stack.pop()
+                for index in newIndices:
+                    grid[index] = None
+
+        return {order[wordInd]: stack[wordInd][1] for wordInd in range(len(order))}
+
+    @staticmethod
+    def _startRange(step, length, cellNum):  # the starting rows/columns a word can use along one axis
+        if step == 1:
+            return range(0, cellNum - length + 1)
+        if step == -1:
+            return range(length - 1, cellNum)
+        return range(0, cellNum)
+
+    def _findPlacements(self, rng, grid, rowCount, columnCount, word):
+        # a random sample of the placements word fits in, sorted by how many letters they share with the grid
+        length = len(word)
+        overlaps = dict()  # (start index, index step) -> letters shared with words already placed
+        for attempt in range(self.placementsPerWord):
+            rowStep, columnStep = rng.choice(self.directions)
+            rowRange = self._startRange(rowStep, length, rowCount)
+            columnRange = self._startRange(columnStep, length, columnCount)
+            if len(rowRange) == 0 or len(columnRange) == 0:
+                continue
+            start = rng.choice(rowRange) * columnCount + rng.choice(columnRange)
+            step = rowStep * columnCount + columnStep
+            if (start, step) in overlaps:
+                continue
+
+            overlap = 0
+            index = start
+            for letter in word:
+                cell = grid[index]
+                if cell is not None:
+                    if cell != letter:
+                        break
+                    overlap += 1
+                index += step
+            else:
+                if overlap < length:  # lying completely on top of another word would not add it to the grid
+                    overlaps[(start, step)] = overlap
+        return sorted(overlaps, key=overlaps.get)
@@ -0,0 +1,161 @@
+# File name: PuzzleLibrary.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class PuzzleLibrary: a memory-mapped binary puzzle file, titles are listed without reading any puzzle
+#       writeLibrary(): writes puzzles to a library file
+#       convertTextToLibrary(): turns a puzzles.txt file into a library file
+#       loadPuzzles(): the puzzles of a library or of a puzzles.txt file, by title
+#       a command line converter: python PuzzleLibrary.py puzzles.txt puzzles.wslib
+# Date: October 17th, 2026
+
+import mmap
+import os
+import struct
+import sys
+from PuzzleData import PuzzleData, iterPuzzleFile
+
+# file layout, all numbers little endian:
+#   header: magic, version, puzzle count, offset of the index
+#   bodies: per puzzle its letters, one byte each row after row, then its words joined by newlines in utf-8
+#   index:  per puzzle the title length, the utf-8 title, then the body offset, row count, column count,
+#           word count and byte length of the words
+MAGIC = b"WSLB"
+VERSION = 1
+HEADER = struct.Struct("<4sHIQ")
+TITLE_LENGTH = struct.Struct("<H")
+INDEX_ENTRY = struct.Struct("<QIIII")
+
+
+class PuzzleLibrary:
+    # opening only reads the header and the index, a puzzle's letters and words are read when it is asked for
+    # behaves like the dict of PuzzleData that Game takes: keys() lists titles, library[title] gives a PuzzleData
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            self._file.close()
+            raise ValueError("%s is not a puzzle library" % path)
+        self._index = dict()  # title -> (body offset, row count, column count, word count, words length)
+        self._titles = []
+        self._readIndex()
+
+    def _readIndex(self):
+        if len(self._map) < HEADER.size:
+            raise ValueError("%s is not a puzzle library" % self.path)
+        magic, version, puzzleCount, position = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            raise ValueError("%s is not a puzzle library" % self.path)
+        if version != VERSION:
+            raise ValueError("%s is a version %d library, expected %d" % (self.path, version, VERSION))
+        for puzzle in range(puzzleCount):
+            titleLength, = TITLE_LENGTH.unpack_from(self._map, position)
+            position += TITLE_LENGTH.size
+            title = self._map[position:position + titleLength].decode("utf-8")
+            position += titleLength
+            self._index[title] = INDEX_ENTRY.unpack_from(self._map, position)
+            position += INDEX_ENTRY.size
+            self._titles.append(title)
+
+    def keys(self):
+        return list(self._titles)
+
+    def __iter__(self):
+        return iter(self._titles)
+
+    def __len__(self):
+        return len(self._titles)
+
+    def __contains__(self, title):
+        return title in self._index
+
+    def getLetterBytes(self, title):
+        # the letters of a puzzle straight from the mapped file, without copying them
+        offset, rowCount, columnCount, wordCount, wordsLength = self._index[title]
+        return memoryview(self._map)[offset:offset + rowCount * columnCount]
+
+    def __getitem__(self, title):
+        offset, rowCount, columnCount, wordCount, wordsLength = self._index[title]
+        lettersEnd = offset + rowCount * columnCount
+        # one string for all the letters, it indexes and iterates like the list of letters readPuzzleFile gives
+        letters = self._map[offset:lettersEnd].decode("latin-1")
+        words = self._map[lettersEnd:lettersEnd + wordsLength].decode("utf-8").split("\n") if wordCount else []
+        return PuzzleData(title=title, rowCount=rowCount, columnCount=columnCount, letters=letters, words=words)
+
+    def get(self, title, default=None):
+        if title not in self._index:
+            return default
+        return self[title]
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        self.close()
+
+
+def writeLibrary(path, puzzles):
+    # puzzles can be any iterable of PuzzleData, only one puzzle is held at a time
+    # returns the amount of puzzles written
+    index = []
+    temporaryPath = path + ".tmp"  # a conversion that fails part way leaves the library it would replace as it was
+    try:
+        with open(temporaryPath, 'wb') as fo:
+            fo.write(HEADER.pack(MAGIC, VERSION, 0, 0))  # filled in once the index is written
+            for puzzleData in puzzles:
+                letters = "".join(puzzleData.letters)
+                if len(letters) != puzzleData.rowCount * puzzleData.columnCount:
+                    raise ValueError("%s has %d letters, expected %d" % (puzzleData.title, len(letters),
+                                                                         puzzleData.rowCount * puzzleData.columnCount))
+                try:
+                    letterBytes = letters.encode("latin-1")
+                except UnicodeEncodeError:
+                    raise ValueError("%s has letters that don't fit in one byte" % puzzleData.title)
+                wordBytes = "\n".join(puzzleData.words).encode("utf-8")
+                index.append((puzzleData.title.encode("utf-8"),
+                              INDEX_ENTRY.pack(fo.tell(), puzzleData.rowCount, puzzleData.columnCount,
+                                               len(puzzleData.words), len(wordBytes))))
+                fo.write(letterBytes)
+                fo.write(wordBytes)
+
+            indexOffset = fo.tell()
+            for title, entry in index:
+                fo.write(TITLE_LENGTH.pack(len(title)))
+                fo.write(title)
+                fo.write(entry)
+            fo.seek(0)
+            fo.write(HEADER.pack(MAGIC, VERSION, len(index), indexOffset))
+    except BaseException:
+        if os.path.exists(temporaryPath):
+            os.remove(temporaryPath)
+        raise
+    os.replace(temporaryPath, path)
+    return len(index)
+
+
+def convertTextToLibrary(textPath, libraryPath):
+    # returns the amount of puzzles converted, the text file is streamed
+    return writeLibrary(libraryPath, iterPuzzleFile(textPath))
+
+
+def loadPuzzles(path, parseErrors=None):
+    # a library is opened and read as puzzles are asked for, a puzzles.txt file is read all at once
+    # and its malformed puzzles are left out, added to parseErrors when it is given
+    if path.endswith(".wslib"):
+        return PuzzleLibrary(path)
+    puzzleDataDict = dict()
+    for puzzleData in iterPuzzleFile(path, skipMalformed=True, errors=parseErrors):
+        puzzleDataDict[puzzleData.title] = puzzleData
+    return puzzleDataDict
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: python PuzzleLibrary.py puzzles.txt puzzles.wslib")
+        sys.exit(2)
+    print("converted %d puzzles" % convertTextToLibrary(sys.argv[1], sys.argv[2]))
@@ -0,0 +1,266 @@
+# File name: PuzzlePack.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       readWordLists(): the themed word lists of a directory, one word per line, named after their file
+#       iterJobs(), getPuzzleSeed(): every puzzle of a pack and the seed it is generated with
+#       buildPuzzlePack(): generates, validates and writes a whole pack across worker processes
+#       a command line pack builder:
+#   python PuzzlePack.py wordlists/ pack.txt --sizes 10x10,15x15 --difficulties easy,hard --count 500
+#   python PuzzlePack.py wordlists/ puzzles.wslib --count 2000 --workers 8      a library Main.py opens directly
+# Date: October 17th, 2026
+
+import argparse
+import hashlib
+import os
+import random
+import shutil
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from PuzzleData import formatPuzzle, iterPuzzleFile
+from PuzzleGenerator import PuzzleGenerator
+from PuzzleLibrary import writeLibrary
+from Solver import validatePuzzle
+
+# difficulty -> (directions words can go in, words per puzzle)
+DIFFICULTIES = {"easy": (((0, 1), (1, 0)), 6),
+                "medium": (((0, 1), (1, 0), (1, 1), (-1, 1)), 10),
+                "hard": (PuzzleGenerator.DIRECTIONS, 15)}
+MAX_ATTEMPTS = 8  # seeds tried per puzzle before it is left out of the pack
+MAX_BACKTRACKS = 200  # a puzzle that needs more gets another seed, which is quicker than backtracking further
+WORD_COVERAGE = 0.5  # the most of a grid's cells the words of a puzzle take up, more rarely fits
+
+
+def readWordLists(directory, skipped=None):
+    # theme -> list of words, for every .txt file of directory, the theme is the file name without ".txt"
+    # words are upper cased, lines that are empty, start with # or aren't one word of letters are left out
+    # only A to Z: the fill letters are A to Z and a .wslib holds one byte per letter, the other words are left out
+    # and added to skipped as "file: word" when it is a list
+    wordLists = dict()
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".txt"):
+            continue
+        words = []
+        seen = set()
+        with open(os.path.join(directory, name), 'r', encoding="utf-8") as fi:
+            for line in fi:
+                word = line.strip().upper()
+                if not word.isalpha() or word in seen:
+                    continue
+                seen.add(word)
+                if not word.isascii():
+                    if skipped is not None:
+                        skipped.append("%s: %s" % (name, word))
+                    continue
+                words.append(word)
+        if words:
+            wordLists[name[:-len(".txt")].replace("_", " ")] = words
+    return wordLists
+
+
+def parseSize(text):  # "15x10" -> (row count, column count), columns first like puzzles.txt
+    columnCount, rowCount = (int(number) for number in text.lower().split("x"))
+    return rowCount, columnCount
+
+
+def getPuzzleSeed(seed, theme, rowCount, columnCount, difficulty, number, attempt):
+    # the seed of one attempt at one puzzle, worked out from what the puzzle is and not from when or where it is
+    # made, so a pack comes out the same with any amount of workers
+    key = "%d|%s|%d|%d|%s|%d|%d" % (seed, theme, rowCount, columnCount, difficulty, number, attempt)
+    return int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "little")
+
+
+def iterJobs(themes, sizes, difficulties, count):
+    # (theme, row count, column count, difficulty, number) of every puzzle of the pack, in the order they are written
+    for theme in themes:
+        for rowCount, columnCount in sizes:
+            for difficulty in difficulties:
+                for number in range(1, count + 1):
+                    yield theme, rowCount, columnCount, difficulty, number
+
+
+# worker processes
+
+_wordLists = None  # theme -> words, given once to every worker by _initWorker()
+_seed = 0
+_generators = dict()  # difficulty -> PuzzleGenerator, made by each worker as needed
+
+
+def _initWorker(wordLists, seed):
+    global _wordLists, _seed
+    _wordLists = wordLists
+    _seed = seed
+    _generators.clear()
+
+
+def _generatePuzzle(job):
+    # returns (puzzle in the puzzles.txt format, None) or (None, the last problem) when every attempt failed
+    theme, rowCount, columnCount, difficulty, number = job
+    directions, wordCount = DIFFICULTIES[difficulty]
+    generator = _generators.get(difficulty)
+    if generator is None:
+        generator = PuzzleGenerator(directions=directions, maxBacktracks=MAX_BACKTRACKS)
+        _generators[difficulty] = generator
+    fitting = [word for word in _wordLists[theme] if len(word) <= max(rowCount, columnCount)]
+    title = "%s %dx%d %s %d" % (theme, columnCount, rowCount, difficulty, number)
+    problem = None
+    for attempt in range(MAX_ATTEMPTS):
+        puzzleSeed = getPuzzleSeed(_seed, theme, rowCount, columnCount, difficulty, number, attempt)
+        words = _pickWords(random.Random(puzzleSeed), fitting, wordCount, rowCount * columnCount * WORD_COVERAGE)
+        if not words:
+            return None, "no word of %s fits in %dx%d" % (theme, columnCount, rowCount)
+        try:
+            puzzleData = generator.generate(title, rowCount, columnCount, words, seed=puzzleSeed)
+        except ValueError as error:
+            problem = str(error)
+            continue
+        problems = validatePuzzle(puzzleData)  # a last check, the generator already removes words spelled twice
+        if not problems:
+            return formatPuzzle(puzzleData), None
+        problem = problems[0]
+    return None, "%s: %s" % (title, problem)
+
+
+def _pickWords(rng, words, wordCount, maxLetters):
+    # up to wordCount random words with maxLetters letters at most, without words the generator refuses together
+    picked = []
+    letterCount = 0
+    for word in rng.sample(words, len(words)):
+        if letterCount + len(word) <= maxLetters and not any(PuzzleGenerator.isNested(word, other)
+                                                             or PuzzleGenerator.isNested(other, word)
+                                                             for other in picked):
+            picked.append(word)
+            letterCount += len(word)
+            if len(picked) == wordCount:
+                break
+    return picked
+
+
+def _generateChunk(jobs):  # a chunk of jobs per call, so sending them to a worker costs less than generating them
+    return [_generatePuzzle(job) for job in jobs]
+
+
+def _iterChunks(jobs, chunkSize):
+    chunk = []
+    for job in jobs:
+        chunk.append(job)
+        if len(chunk) == chunkSize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iterPuzzleTexts(wordLists, sizes, difficulties, count, seed=0, workers=None, chunkSize=32):
+    # yields (puzzle text or None, problem or None) for every job of iterJobs(), in order
+    # with more than one worker the jobs go to a process pool a chunk at a time, only a few chunks per worker are
+    # ever waiting or done but not yet yielded, so memory stays the same however large the pack is
+    jobs = iterJobs(sorted(wordLists), sizes, difficulties, count)
+    chunks = _iterChunks(jobs, chunkSize)
+    if workers == 1:
+        _initWorker(wordLists, seed)
+        for chunk in chunks:
+            for result in _generateChunk(chunk):
+                yield result
+        return
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers, initializer=_initWorker, initargs=(wordLists, seed)) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_generateChunk, chunk))
+            if len(pending) >= workers * 3:
+                for result in pending.popleft().result():
+                    yield result
+        while pending:
+            for result in pending.popleft().result():
+                yield result
+
+
+def buildPuzzlePack(wordListDirectory, outputPath, sizes, difficulties, count, seed=0, workers=None, chunkSize=32,
+                    problems=None, skippedWords=None):
+    # writes the pack to outputPath, a puzzles.txt file or a .wslib library when it ends with .wslib
+    # puzzles that can't be generated are left out, with why added to problems if it is a list
+    # words that aren't A to Z are left out, added to skippedWords if it is a list
+    # returns the amount of puzzles written
+    wordLists = readWordLists(wordListDirectory, skippedWords)
+    if not wordLists:
+        raise ValueError("no word lists in %s" % wordListDirectory)
+    for difficulty in difficulties:
+        if difficulty not in DIFFICULTIES:
+            raise ValueError("unknown difficulty %r, expected one of %s" % (difficulty, ", ".join(DIFFICULTIES)))
+
+    # puzzles.txt starts with the amount of puzzles, which is only known at the end: the puzzles go to a
+    # temporary file first and are copied after the count
+    bodyPath = outputPath + ".body.tmp"
+    puzzleCount = 0
+    try:
+        with open(bodyPath, 'w', encoding="utf-8") as fo:
+            for text, problem in iterPuzzleTexts(wordLists, sizes, difficulties, count, seed, workers, chunkSize):
+                if text is None:
+                    if problems is not None:
+                        problems.append(problem)
+                    continue
+                fo.write(text)
+                puzzleCount += 1
+
+        temporaryPath = outputPath + ".tmp"
+        if outputPath.endswith(".wslib"):
+            textPath = outputPath + ".txt.tmp"
+            try:
+                with open(textPath, 'w', encoding="utf-8") as fo, open(bodyPath, 'r', encoding="utf-8") as fi:
+                    fo.write(str(puzzleCount) + "\n")
+                    shutil.copyfileobj(fi, fo)
+                writeLibrary(temporaryPath, iterPuzzleFile(textPath))
+            finally:
+                if os.path.exists(textPath):
+                    os.remove(textPath)
+        else:
+            with open(temporaryPath, 'w', encoding="utf-8") as fo, open(bodyPath, 'r', encoding="utf-8") as fi:
+                fo.write(str(puzzleCount) + "\n")
+                shutil.copyfileobj(fi, fo)
+        os.replace(temporaryPath, outputPath)  # a game reading the pack never sees half of it
+    finally:
+        if os.path.exists(bodyPath):
+            os.remove(bodyPath)
+    return puzzleCount
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generates a pack of validated puzzles from themed word lists.")
+    parser.add_argument("wordLists", help="a directory of .txt files, one word per line, each file is a theme")
+    parser.add_argument("output", help="a puzzles.txt file, or a .wslib library")
+    parser.add_argument("--sizes", default="10x10,15x15", help="columns x rows of the puzzles, eg. 10x10,20x15")
+    parser.add_argument("--difficulties", default="easy,medium,hard", help=", ".join(DIFFICULTIES))
+    parser.add_argument("--count", type=int, default=10, help="puzzles per theme, size and difficulty")
+    parser.add_argument("--seed", type=int, default=0, help="the same seed and word lists give the same pack")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to one per core")
+    args = parser.parse_args(argv)
+
+    try:
+        sizes = [parseSize(size) for size in args.sizes.split(",") if size]
+    except ValueError:
+        print("sizes look like 10x10,20x15")
+        return 2
+    problems = []
+    skippedWords = []
+    start = time.perf_counter()
+    try:
+        puzzleCount = buildPuzzlePack(args.wordLists, args.output, sizes, args.difficulties.split(","), args.count,
+                                      seed=args.seed, workers=args.workers, problems=problems,
+                                      skippedWords=skippedWords)
+    except (OSError, ValueError) as error:
+        print(error)
+        return 1
+    elapsed = time.perf_counter() - start
+    for word in skippedWords:
+        print("left out the word %s, only A to Z can be in a puzzle" % word)
+    for problem in problems:
+        print("left out " + problem)
+    print("%d puzzles written to %s in %.1f s (%.0f per second)" % (puzzleCount, args.output, elapsed,
+                                                                      puzzleCount / max(elapsed, 1e-9)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+# File name: PuzzleSession.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class PuzzleSession: one game of a puzzle, its selection, found words and time, without pygame
+# Date: October 17th, 2026
+
+import time
+from Solver import WordSearchSolver, buildAnswerKey, extendAnswerKey
+
+
+class PuzzleSession:
+    # the rules of the game, played by the word search grids on screen and by SessionServer for remote players
+    # squares are (row, column). A selection goes from its first square to its last square, which are on the same
+    # row, column or diagonal, and it is a word only if it starts and ends where the word was placed
+    # letters: one letter per cell, row after row, a list of letters or one string
+    # answerKey: (start, end) -> word as built by Solver.buildAnswerKey, sessions of the same puzzle can share one
+    # clock: returns the time in seconds, time.monotonic unless a game is replayed or tested
+    def __init__(self, rowCount, columnCount, letters, words, foundWordList=None, answerKey=None,
+                 clock=time.monotonic):
+        self.rowCount = rowCount
+        self.columnCount = columnCount
+        self.letters = letters
+        self.words = words
+        if answerKey is None:
+            answerKey = buildAnswerKey(words, letters, rowCount, columnCount)
+        self.answerKey = answerKey
+        self._solver = None  # a WordSearchSolver of the words, made when the grid first grows
+        # the list is added to as words are found, in the order they are found. Progress is known by evaluating
+        # this list outside the class, the set is what selections are checked against
+        self.foundWordList = foundWordList if foundWordList is not None else list()
+        self.foundWords = set(self.foundWordList)
+        # used in selection
+        self.firstSelecSquare = None
+        self.lastSelecSquare = None
+        # times
+        self.clock = clock
+        self.startTime = clock()
+        self.finishTime = None  # when the last word was found
+        self.lastActive = self.startTime  # when the selection last changed, or a server last used the session
+
+    @classmethod
+    def fromPuzzleData(cls, puzzleData, answerKey=None, clock=time.monotonic):
+        return cls(puzzleData.rowCount, puzzleData.columnCount, puzzleData.letters, puzzleData.words,
+                   answerKey=answerKey, clock=clock)
+
+    def setLetters(self, letters, rowCount, columnCount):  # for a grid that grew, words can be in new places
+        self.letters = letters
+        self.rowCount = rowCount
+        self.columnCount = columnCount
+        self.answerKey = buildAnswerKey(self.words, letters, rowCount, columnCount)
+
+    def growLetters(self, letters, rowCount, columnCount):
+        # for a grid that got more rows or columns at its bottom or right, the old squares keeping their letters:
+        # only the places a word can cross the new squares are looked for
+        if self._solver is None:
+            self._solver = WordSearchSolver(self.words)
+        answerKey = dict(self.answerKey)  # the old one can be shared with other sessions
+        extendAnswerKey(answerKey, self.words, letters, rowCount, columnCount, self.rowCount, self.columnCount,
+                        self._solver)
+        self.answerKey = answerKey
+        self.letters = letters
+        self.rowCount = rowCount
+        self.columnCount = columnCount
+
+    # selection
+
+    @staticmethod
+    def sameRow(coords1, coords2):
+        return coords1[0] == coords2[0]
+
+    @staticmethod
+    def sameColumn(coords1, coords2):
+        return coords1[1] == coords2[1]
+
+    @staticmethod
+    def sameDiag(coords1, coords2):
+        return abs(coords1[0] - coords2[0]) == abs(coords1[1] - coords2[1])
+
+    @classmethod
+    def inAllowedDirection(cls, coords1, coords2):
+        return (cls.sameRow(coords1, coords2) or cls.sameColumn(coords1, coords2)
+                or cls.sameDiag(coords1, coords2))
+
+    def isInside(self, coords):
+        return 0 <= coords[0] < self.rowCount and 0 <= coords[1] < self.columnCount
+
+    def startSelection(self, coords):
+        self.firstSelecSquare = coords
+        self.lastSelecSquare = None
+        self.lastActive = self.clock()
+
+    def extendSelection(self, coords):
+        # moves the end of the selection to coords, returns False when that changes nothing or isn't allowed
+        if self.firstSelecSquare is None or coords == self.lastSelecSquare:
+            return False
+        if not self.inAllowedDirection(self.firstSelecSquare, coords):
+            return False
+        self.lastSelecSquare = coords
+        self.lastActive = self.clock()
+        return True
+
+    def clearSelection(self):
+        self.firstSelecSquare = None
+        self.lastSelecSquare = None
+
+    def getSelectionEnds(self):  # (first square, last square) of the selection, the same square twice for one letter
+        last = self.firstSelecSquare if self.lastSelecSquare is None else self.lastSelecSquare
+        return self.firstSelecSquare, last
+
+    def getSelection(self):
+        # the selection as (anchor, direction, length), direction being (row step, column step), None if nothing
+        # is selected. first and last square have to be in an allowed direction
+        if self.firstSelecSquare is None:
+            return None
+        first, last = self.getSelectionEnds()
+        rowDistance = last[0] - first[0]
+        columnDistance = last[1] - first[1]
+        direction = ((rowDistance > 0) - (rowDistance < 0), (columnDistance > 0) - (columnDistance < 0))
+        if direction == (0, 0):
+            direction = (0, 1)  # a single square reads like a row
+        return first, direction, max(abs(rowDistance), abs(columnDistance)) + 1
+
+    def getSelectionText(self):  # the letters of the selection from its first square, "" if nothing is selected
+        selection = self.getSelection()
+        if selection is None:
+            return ""
+        (rowInd, columnInd), (rowStep, columnStep), length = selection
+        return "".join(self.letters[(rowInd + step * rowStep) * self.columnCount + columnInd + step * columnStep]
+                       for step in range(length))
+
+    def validateSelection(self):
+        # looks up the word between the ends of the selection, returns it when it is newly found, None otherwise
+        # the selection is kept, the grids still need it to color the word's squares
+        word = self.answerKey.get(self.getSelectionEnds())
+        if word is None or word in self.foundWords:
+            return None
+        self.foundWords.add(word)
+        self.foundWordList.append(word)
+        if self.isComplete():
+            self.finishTime = self.clock()
+        return word
+
+    # progress
+
+    def isComplete(self):
+        return len(self.foundWords) == len(set(self.words))
+
+    def getElapsed(self):  # seconds played, stops when the last word is found
+        end = self.finishTime if self.finishTime is not None else self.clock()
+        return end - self.startTime
+
+    def getState(self):
+        return {"found": list(self.foundWordList), "complete": self.isComplete(), "elapsed": self.getElapsed()}
@@ -0,0 +1,104 @@
+# File name: ScaledDisplay.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class ScaledDisplay: a window showing a surface drawn at a fixed logical resolution, scaled to the window size
+# Date: October 17th, 2026
+
+import math
+import pygame
+
+BAR_COLOR = (0, 0, 0)  # around the picture when the window doesn't have its aspect ratio
+
+
+class ScaledDisplay:
+    # the game lays out and draws everything on surface, at logicalSize, present() shows it in the window
+    # when the window has another size, or can be resized or made fullscreen, surface is a separate surface scaled
+    # to fit the window, keeping its aspect ratio. Resizing only rescales what is already drawn, nothing gets laid
+    # out or rendered again. Otherwise surface is the window itself and presenting is pygame.display.update()
+    # windowSize: None for the logical size, or the desktop size when fullscreen
+    def __init__(self, logicalSize, windowSize=None, resizable=False, fullscreen=False, smooth=True):
+        self.logicalSize = tuple(logicalSize)
+        self.smooth = smooth  # smoothscale instead of nearest neighbour scaling
+        flags = 0
+        if resizable:
+            flags |= pygame.RESIZABLE
+        if fullscreen:
+            flags |= pygame.FULLSCREEN
+            if windowSize is None:
+                windowSize = (0, 0)  # pygame picks the desktop size
+        self.window = pygame.display.set_mode(windowSize or self.logicalSize, flags)
+        self.scaled = bool(flags) or self.window.get_size() != self.logicalSize
+        self.surface = pygame.Surface(self.logicalSize).convert() if self.scaled else self.window
+        self.scale = 1
+        self.viewport = self.window.get_rect()  # where the picture is in the window
+        self._updateScale()
+
+    def _updateScale(self):
+        windowWidth, windowHeight = self.window.get_size()
+        self.scale = min(windowWidth / self.logicalSize[0], windowHeight / self.logicalSize[1])
+        width = round(self.logicalSize[0] * self.scale)
+        height = round(self.logicalSize[1] * self.scale)
+        self.viewport = pygame.Rect((windowWidth - width) // 2, (windowHeight - height) // 2, width, height)
+
+    # coordinates
+
+    def toLogical(self, pos):  # a window position, eg. of the mouse, in logical coordinates
+        return (int((pos[0] - self.viewport.left) / self.scale), int((pos[1] - self.viewport.top) / self.scale))
+
+    def getMousePos(self):
+        return self.toLogical(pygame.mouse.get_pos())
+
+    def toWindowRect(self, rect):  # the window pixels a logical rect ends up on
+        left = math.floor(rect.left * self.scale)
+        top = math.floor(rect.top * self.scale)
+        right = math.ceil(rect.right * self.scale)
+        bottom = math.ceil(rect.bottom * self.scale)
+        return pygame.Rect(self.viewport.left + left, self.viewport.top + top, right - left, bottom - top)
+
+    # presenting
+
+    def present(self, rects=None):
+        # shows the surface in the window, only the logical areas in rects when given
+        if not self.scaled:
+            if rects is None:
+                pygame.display.update()
+            else:
+                pygame.display.update(rects)
+            return
+        if rects is None:
+            if self.viewport != self.window.get_rect():
+                self.window.fill(BAR_COLOR)
+            self._scaleArea(self.surface.get_rect(), self.viewport)
+            pygame.display.update()
+            return
+
+        windowRects = []
+        surfaceRect = self.surface.get_rect()
+        for rect in rects:
+            if self.scale != 1:
+                rect = rect.inflate(2, 2)  # a pixel around it, so neighbouring areas blend into each other
+            rect = rect.clip(surfaceRect)
+            if rect.width == 0 or rect.height == 0:
+                continue
+            windowRect = self.toWindowRect(rect)
+            self._scaleArea(rect, windowRect)
+            windowRects.append(windowRect)
+        pygame.display.update(windowRects)
+
+    def _scaleArea(self, rect, windowRect):
+        if windowRect.size == rect.size:
+            self.window.blit(self.surface, windowRect.topleft, rect)
+            return
+        windowRect = windowRect.clip(self.viewport)
+        scale = pygame.transform.smoothscale if self.smooth else pygame.transform.scale
+        scaled = scale(self.surface.subsurface(rect), self.toWindowRect(rect).size)
+        self.window.blit(scaled, windowRect.topleft)
+
+    def handleEvent(self, event):
+        # call with every event, returns True when the window changed size, the picture is then rescaled into it
+        if event.type == pygame.VIDEORESIZE and self.scaled:
+            self.window = pygame.display.get_surface()
+            self._updateScale()
+            self.present()
+            return True
+        return False
@@ -0,0 +1,238 @@
+# File name: SessionServer.py
+# Programmer: Sebastien Marleau
+# Description: hosts word search games for many players at once in one process, without pygame
+#              clients connect over TCP or a unix socket and send one json object per line, each gets one line back
+#   python SessionServer.py --port 8765
+#   python SessionServer.py --unix /tmp/wordsearch.sock --max-sessions 50000 --idle-timeout 600
+# requests, an "id" in a request is copied into its answer:
+#   {"op": "list"}                                  -> {"ok": true, "puzzles": [title, ...]}
+#   {"op": "open", "puzzle": title}                 -> {"ok": true, "session": sessionId, "rows": 10, "columns": 10,
+#                                                       "letters": "ABC...", "words": [...]}
+#   {"op": "select", "session": sessionId, "start": [row, column], "end": [row, column]}
+#                                                   -> {"ok": true, "letters": "CAT"}
+#   {"op": "validate", "session": sessionId, "start": [row, column], "end": [row, column]}
+#                                                   -> {"ok": true, "word": "CAT" or null, "found": [...],
+#                                                       "complete": false, "elapsed": 12.5}
+#   {"op": "state", "session": sessionId}           -> {"ok": true, "found": [...], "complete": false, "elapsed": 12.5}
+#   {"op": "close", "session": sessionId}           -> {"ok": true}
+#   {"op": "stats"}                                 -> {"ok": true, "sessions": 1200, "evicted": 30}
+# a request that can't be answered gets {"ok": false, "error": message}
+# Date: October 17th, 2026
+
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import sys
+import time
+from collections import OrderedDict
+from PuzzleLibrary import loadPuzzles
+from PuzzleSession import PuzzleSession
+from Solver import buildAnswerKey
+
+
+class SessionError(Exception):
+    pass  # a request that can't be answered, its message is sent back to the client
+
+
+class SessionServer:
+    # sessions are kept in the order they were last used: when there are maxSessions of them the least recently used
+    # one is dropped to make room, and a sweep every sweepInterval seconds drops those unused for idleTimeout seconds
+    # a session only holds its selection, found words and times, the puzzle and its answer key are shared by every
+    # session playing it
+    # clock: returns the time in seconds, given to every session
+    def __init__(self, puzzleDataDict, maxSessions=10000, idleTimeout=900, sweepInterval=30, clock=time.monotonic):
+        self.puzzleDataDict = puzzleDataDict
+        self.maxSessions = maxSessions
+        self.idleTimeout = idleTimeout
+        self.sweepInterval = sweepInterval
+        self.clock = clock
+        self.sessions = OrderedDict()  # sessionId -> PuzzleSession, least recently used first
+        self.evictedCount = 0
+        self._puzzles = dict()  # title -> (PuzzleData, answer key), for the puzzles played so far
+        self._operations = {"list": self.listPuzzles, "open": self.openSession, "select": self.select,
+                            "validate": self.validate, "state": self.getState, "close": self.closeSession,
+                            "stats": self.getStats}
+
+    # sessions
+
+    def _getPuzzle(self, title):
+        if not isinstance(title, str):
+            raise SessionError("puzzle has to be a title")
+        puzzle = self._puzzles.get(title)
+        if puzzle is None:
+            if title not in self.puzzleDataDict:
+                raise SessionError("no puzzle called %r" % title)
+            puzzleData = self.puzzleDataDict[title]
+            answerKey = buildAnswerKey(puzzleData.words, puzzleData.letters, puzzleData.rowCount,
+                                       puzzleData.columnCount)
+            puzzle = (puzzleData, answerKey)
+            self._puzzles[title] = puzzle
+        return puzzle
+
+    def _getSession(self, request):
+        sessionId = request.get("session")
+        if not isinstance(sessionId, str):
+            raise SessionError("session has to be a session id")
+        session = self.sessions.get(sessionId)
+        if session is None:
+            raise SessionError("no session %r, it may have been closed or evicted" % sessionId)
+        self.sessions.move_to_end(sessionId)
+        session.lastActive = self.clock()  # evictIdle() goes by the same order as the least recently used
+        return session
+
+    @staticmethod
+    def _getSquare(request, key, session):
+        square = request.get(key)
+        if (not isinstance(square, list) or len(square) != 2 or not all(type(ind) is int for ind in square)
+                or not session.isInside(square)):
+            raise SessionError("%s has to be [row, column] inside the puzzle" % key)
+        return tuple(square)
+
+    def _selectFromRequest(self, request, session):
+        start = self._getSquare(request, "start", session)
+        end = self._getSquare(request, "end", session)
+        if not session.inAllowedDirection(start, end):
+            raise SessionError("start and end have to be on the same row, column or diagonal")
+        session.startSelection(start)
+        session.extendSelection(end)
+
+    def evictIdle(self):  # drops the sessions unused for idleTimeout seconds, returns how many
+        now = self.clock()
+        evicted = 0
+        while self.sessions:
+            sessionId, session = next(iter(self.sessions.items()))
+            if now - session.lastActive < self.idleTimeout:
+                break  # the rest were used later
+            del self.sessions[sessionId]
+            evicted += 1
+        self.evictedCount += evicted
+        return evicted
+
+    # operations, each takes the request and returns the answer's fields
+
+    def listPuzzles(self, request):
+        return {"puzzles": list(self.puzzleDataDict.keys())}
+
+    def openSession(self, request):
+        puzzleData, answerKey = self._getPuzzle(request.get("puzzle"))
+        while len(self.sessions) >= self.maxSessions:
+            self.sessions.popitem(last=False)
+            self.evictedCount += 1
+        sessionId = secrets.token_hex(8)
+        self.sessions[sessionId] = PuzzleSession.fromPuzzleData(puzzleData, answerKey=answerKey, clock=self.clock)
+        return {"session": sessionId, "rows": puzzleData.rowCount, "columns": puzzleData.columnCount,
+                "letters": "".join(puzzleData.letters), "words": puzzleData.words}
+
+    def select(self, request):
+        session = self._getSession(request)
+        self._selectFromRequest(request, session)
+        return {"letters": session.getSelectionText()}
+
+    def validate(self, request):
+        session = self._getSession(request)
+        self._selectFromRequest(request, session)
+        word = session.validateSelection()
+        session.clearSelection()
+        answer = {"word": word}
+        answer.update(session.getState())
+        return answer
+
+    def getState(self, request):
+        return self._getSession(request).getState()
+
+    def closeSession(self, request):
+        self._getSession(request)
+        del self.sessions[request["session"]]
+        return {}
+
+    def getStats(self, request):
+        return {"sessions": len(self.sessions), "evicted": self.evictedCount}
+
+    # protocol
+
+    def handleLine(self, line):
+        # one request line in, one answer line out
+        answer = {"ok": True}
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise SessionError("a request is a json object")
+            if "id" in request:
+                answer["id"] = request["id"]
+            if not isinstance(request.get("op"), str):
+                raise SessionError("op has to be one of %s" % ", ".join(self._operations))
+            operation = self._operations.get(request.get("op"))
+            if operation is None:
+                raise SessionError("unknown op %r" % request.get("op"))
+            answer.update(operation(request))
+        except (SessionError, ValueError) as error:
+            answer["ok"] = False
+            answer["error"] = str(error)
+        return (json.dumps(answer) + "\n").encode("utf-8")
+
+    async def handleClient(self, reader, writer):
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:  # longer than the stream limit
+                    writer.write(b'{"ok": false, "error": "request too long"}\n')
+                    break
+                if not line:
+                    break
+                writer.write(self.handleLine(line))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _sweep(self):
+        while True:
+            await asyncio.sleep(self.sweepInterval)
+            self.evictIdle()
+
+    async def serve(self, host="127.0.0.1", port=8765, unixPath=None, backlog=1024):
+        # backlog: connections waiting to be accepted, the default of 100 refuses bursts of clients connecting at once
+        if unixPath is not None:
+            server = await asyncio.start_unix_server(self.handleClient, path=unixPath, backlog=backlog)
+        else:
+            server = await asyncio.start_server(self.handleClient, host, port, backlog=backlog)
+        sweeper = asyncio.ensure_future(self._sweep())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Hosts word search sessions over TCP or a unix socket.")
+    parser.add_argument("--puzzles", default="puzzles.txt", help="a puzzles.txt file or a .wslib library")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="listen on this unix socket instead of TCP")
+    parser.add_argument("--max-sessions", type=int, default=10000, help="the least recently used session is dropped "
+                                                                        "to open one more")
+    parser.add_argument("--idle-timeout", type=float, default=900, help="seconds before an unused session is dropped")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.puzzles):
+        print("no puzzle file at " + args.puzzles)
+        return 1
+    parseErrors = []
+    puzzleDataDict = loadPuzzles(args.puzzles, parseErrors)
+    for error in parseErrors:
+        print(args.puzzles + ", " + str(error))
+    server = SessionServer(puzzleDataDict, maxSessions=args.max_sessions, idleTimeout=args.idle_timeout)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -7,6 +7,7 @@
 from Grid import MenuGrid
 from BoxComponents import WordBox
 from Colors import *
+from Fonts import Fonts
 import pygame
 
 
@@ -18,7 +19,7 @@ class SimpleMenu:
                  optionsYCellNum, optionsCellWidth, optionsCellHeight, listOfFunctionsForOptions=[],
                  drawOptionsButtonsBorder=True, optionsBorderColor=Colors.BLACK, optionsButtonsBordersGrow=True,
                  optionsBorderGrowColor=Colors.BLACK, optionsBoxBackgroundColor=None, optionsButtonsDarken=True,
-                 optionsFont=pygame.font.SysFont("arial", 20), titleFont=pygame.font.SysFont("arial", 45),
+                 optionsFont=Fonts.get("arial", 20), titleFont=Fonts.get("arial", 45),
                  titleColor=Colors.BLACK, addExitButton=True, visible=True):
 
         textSize = titleFont.size(title)
@@ -63,3 +64,17 @@ class SimpleMenu:
         if self.visible:
             self.titleBox.draw(win)
             self.menuGrid.draw(win)
+
+    # dirty areas, used by DirtyRenderer
+
+    def getBounds(self):
+        return self.titleBox.getBounds().union(self.menuGrid.getBounds())
+
+    def popDirtyRects(self):
+        return self.titleBox.popDirtyRects() + self.menuGrid.popDirtyRects()
+
+    def drawArea(self, win, area):
+        if self.visible:
+            if self.titleBox.getBounds().colliderect(area):
+                self.titleBox.draw(win)
+            self.menuGrid.drawArea(win, area)
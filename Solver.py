@@ -0,0 +1,249 @@
+# File name: Solver.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class WordSearchSolver: finds every occurrence of a list of words in a grid of letters
+#       solvePuzzle(), validatePuzzle(): solve and check a PuzzleData
+#       buildAnswerKey(): maps the two ends of every word in a grid to the word, for checking selections
+#       extendAnswerKey(): adds the places a word crosses the new rows or columns of a grid that grew
+#       a command line validator for whole puzzle files: python Solver.py puzzles.txt [--workers N]
+# Date: October 17th, 2026
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from PuzzleData import iterPuzzleFile
+
+
+class WordSearchSolver:
+    # builds an Aho-Corasick automaton (a trie with failure links) from the words once,
+    # then reads every row, column and diagonal of a grid in both directions through it,
+    # so each line is scanned one time no matter how many words there are
+    # occurrences are ((startRow, startColumn), (endRow, endColumn)), the same coordinates WordSearchGrid uses
+    def __init__(self, words):
+        self.words = list(words)
+        self._goto = [dict()]  # state -> {letter: next state}, state 0 is the root
+        self._fail = [0]  # state -> longest proper suffix that is also a state
+        self._output = [[]]  # state -> indices of the words ending at this state
+        for wordInd in range(len(self.words)):
+            self._addWord(wordInd)
+        self._buildFailLinks()
+
+    def _addWord(self, wordInd):
+        state = 0
+        for letter in self.words[wordInd]:
+            nextState = self._goto[state].get(letter)
+            if nextState is None:
+                nextState = len(self._goto)
+                self._goto.append(dict())
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][letter] = nextState
+            state = nextState
+        self._output[state].append(wordInd)
+
+    def _buildFailLinks(self):
+        queue = list(self._goto[0].values())  # breadth first, the root's children fail to the root
+        for state in queue:
+            for letter, nextState in self._goto[state].items():
+                queue.append(nextState)
+                fail = self._fail[state]
+                while fail and letter not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nextState] = self._goto[fail].get(letter, 0)
+                # words ending at the fail state also end here
+                self._output[nextState] = self._output[nextState] + self._output[self._fail[nextState]]
+
+    @staticmethod
+    def lines(rowCount, columnCount):
+        # every row, column and diagonal as lists of indices into the letters, read in one direction
+        # reading them backwards covers the other four directions
+        for rowInd in range(rowCount):
+            yield range(rowInd * columnCount, (rowInd + 1) * columnCount)
+        for columnInd in range(columnCount):
+            yield range(columnInd, rowCount * columnCount, columnCount)
+        for startRow, startColumn in ([(rowInd, 0) for rowInd in range(rowCount)]
+                                      + [(0, columnInd) for columnInd in range(1, columnCount)]):
+            length = min(rowCount - startRow, columnCount - startColumn)  # down and right
+            yield range(startRow * columnCount + startColumn,
+                        (startRow + length) * columnCount + startColumn, columnCount + 1)
+        if columnCount == 1:
+            return  # the down and left diagonals are single cells, already covered by the rows
+        for startRow, startColumn in ([(0, columnInd) for columnInd in range(columnCount)]
+                                      + [(rowInd, columnCount - 1) for rowInd in range(1, rowCount)]):
+            length = min(rowCount - startRow, startColumn + 1)  # down and left
+            yield range(startRow * columnCount + startColumn,
+                        (startRow + length) * columnCount + startColumn - length, columnCount - 1)
+
+    def findAll(self, letters, rowCount, columnCount, lines=None):
+        # returns word -> list of occurrences, words that are not in the grid get an empty list
+        # keyed by the unordered ends, as palindromes are found reading both ways
+        # lines: the parts of lines to read, as ranges of indices into the letters, every whole line when None
+        found = [dict() for word in self.words]
+        goto, fail, output = self._goto, self._fail, self._output
+        for line in (self.lines(rowCount, columnCount) if lines is None else lines):
+            for indices in (line, line[::-1]):
+                state = 0
+                for position in range(len(indices)):
+                    letter = letters[indices[position]]
+                    while state and letter not in goto[state]:
+                        state = fail[state]
+                    state = goto[state].get(letter, 0)
+                    for wordInd in output[state]:
+                        start = indices[position - len(self.words[wordInd]) + 1]
+                        end = indices[position]
+                        found[wordInd].setdefault((min(start, end), max(start, end)), (start, end))
+
+        occurrences = dict()
+        for wordInd in range(len(self.words)):
+            wordOccurrences = []
+            for key in sorted(found[wordInd]):
+                start, end = found[wordInd][key]
+                wordOccurrences.append((divmod(start, columnCount), divmod(end, columnCount)))
+            occurrences.setdefault(self.words[wordInd], wordOccurrences)
+        return occurrences
+
+
+def solvePuzzle(puzzleData):
+    return WordSearchSolver(puzzleData.words).findAll(puzzleData.letters, puzzleData.rowCount,
+                                                      puzzleData.columnCount)
+
+
+def buildAnswerKey(words, letters, rowCount, columnCount):
+    # (start, end) -> word for every place a word is in the grid, start and end are (row, column)
+    # a selection made from either end of a word finds it, reading it the way it is spelled comes first
+    # for when a word and its reverse are both in the list
+    occurrences = WordSearchSolver(words).findAll(letters, rowCount, columnCount)
+    answerKey = dict()
+    for word, wordOccurrences in occurrences.items():
+        for start, end in wordOccurrences:
+            answerKey[(start, end)] = word
+    for word, wordOccurrences in occurrences.items():
+        for start, end in wordOccurrences:
+            answerKey.setdefault((end, start), word)
+    return answerKey
+
+
+def _countWhile(length, predicate):  # how many positions from the start predicate holds for, it holds for a prefix
+    low, high = 0, length
+    while low < high:
+        middle = (low + high) // 2
+        if predicate(middle):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+def _iterGrownParts(rowCount, columnCount, oldRowCount, oldColumnCount, reach):
+    # the part of every line that can hold a word crossing a square outside the old oldRowCount x oldColumnCount
+    # grid, reach being the longest word length minus one. Along any line the new squares are at its start, its
+    # end or both, as rows and columns only ever go one way along a line, so only reach squares past them matter
+    for line in WordSearchSolver.lines(rowCount, columnCount):
+        length = len(line)
+        start, stop = length, 0
+        oldRows = _countWhile(length, lambda position: line[position] // columnCount < oldRowCount)
+        if oldRows < length:
+            start, stop = min(start, oldRows - reach), length
+        if line.step == columnCount or length == 1:  # a column, all of it is new or none of it
+            if line[0] % columnCount >= oldColumnCount:
+                start, stop = 0, length
+        elif line[-1] % columnCount > line[0] % columnCount:  # the columns go up along the line
+            oldColumns = _countWhile(length, lambda position: line[position] % columnCount < oldColumnCount)
+            if oldColumns < length:
+                start, stop = min(start, oldColumns - reach), length
+        else:  # down and left, the new columns come first
+            newColumns = _countWhile(length, lambda position: line[position] % columnCount >= oldColumnCount)
+            if newColumns:
+                start, stop = 0, max(stop, newColumns + reach)
+        if start < stop:
+            yield line[max(0, start):min(length, stop)]
+
+
+def extendAnswerKey(answerKey, words, letters, rowCount, columnCount, oldRowCount, oldColumnCount, solver=None):
+    # adds the places words are in a grid that grew from oldRowCount x oldColumnCount to answerKey, the old squares
+    # keeping their letters and (row, column). Only the parts of lines near the new squares are read, so the cost
+    # follows the size of what was added and not of the grid. Ends up as buildAnswerKey() of the whole grid would
+    # solver: a WordSearchSolver of words, to not build it every time
+    if solver is None:
+        solver = WordSearchSolver(words)
+    reach = max(len(word) for word in words) - 1 if words else 0
+    lines = _iterGrownParts(rowCount, columnCount, oldRowCount, oldColumnCount, reach)
+    newOccurrences = []  # the places having a new square, the others are in answerKey already
+    for word, wordOccurrences in solver.findAll(letters, rowCount, columnCount, lines).items():
+        for start, end in wordOccurrences:
+            if (start[0] >= oldRowCount or start[1] >= oldColumnCount or end[0] >= oldRowCount
+                    or end[1] >= oldColumnCount):
+                newOccurrences.append((start, end, word))
+    for start, end, word in newOccurrences:
+        answerKey[(start, end)] = word
+    for start, end, word in newOccurrences:
+        answerKey.setdefault((end, start), word)
+    return answerKey
+
+
+def validatePuzzle(puzzleData):
+    # returns a list of problems, empty when every word appears exactly once
+    if len(puzzleData.letters) != puzzleData.rowCount * puzzleData.columnCount:
+        return ["has %d letters, expected %d" % (len(puzzleData.letters),
+                                                 puzzleData.rowCount * puzzleData.columnCount)]
+    problems = []
+    for word, occurrences in solvePuzzle(puzzleData).items():
+        if not occurrences:
+            problems.append("%s is not in the grid" % word)
+        elif len(occurrences) > 1:
+            problems.append("%s appears %d times: %s" % (word, len(occurrences),
+                                                         ", ".join("%s-%s" % occurrence for occurrence in occurrences)))
+    return problems
+
+
+def _validateWithTitle(puzzleData):  # used by the worker processes
+    return puzzleData.title, validatePuzzle(puzzleData)
+
+
+def validatePuzzleFile(path, workers=None, chunkSize=16, parseErrors=None):
+    # yields (title, problems) for every puzzle of the file, in order
+    # the file is streamed, malformed puzzles are skipped and their errors added to parseErrors if it is a list
+    # with more than one worker the puzzles are spread across processes, a batch at a time
+    puzzles = iterPuzzleFile(path, skipMalformed=True, errors=parseErrors)
+    batch = list(islice(puzzles, chunkSize))
+    if workers == 1 or len(batch) < chunkSize:
+        for puzzleData in batch:
+            yield _validateWithTitle(puzzleData)
+        for puzzleData in puzzles:
+            yield _validateWithTitle(puzzleData)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        batchSize = chunkSize * (workers or os.cpu_count() or 1) * 4  # bounds how many puzzles are held in memory
+        while batch:
+            batch += islice(puzzles, batchSize - len(batch))
+            for result in executor.map(_validateWithTitle, batch, chunksize=chunkSize):
+                yield result
+            batch = list(islice(puzzles, batchSize))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Checks that every word of every puzzle appears exactly once.")
+    parser.add_argument("puzzleFile", nargs="?", default="puzzles.txt")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, defaults to one per core")
+    args = parser.parse_args(argv)
+
+    invalidCount = 0
+    puzzleCount = 0
+    parseErrors = []
+    for title, problems in validatePuzzleFile(args.puzzleFile, workers=args.workers, parseErrors=parseErrors):
+        puzzleCount += 1
+        if problems:
+            invalidCount += 1
+            print(title + ":")
+            for problem in problems:
+                print("    " + problem)
+    for error in parseErrors:
+        print(error)
+    print("%d of %d puzzles are valid" % (puzzleCount - invalidCount, puzzleCount))
+    return 1 if invalidCount or parseErrors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
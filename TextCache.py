@@ -0,0 +1,83 @@
+# File name: TextCache.py
+# Programmer: Sebastien Marleau
+# Contains:
+#       class TextSurfaceCache: a size-bounded LRU cache of rendered text surfaces and their sizes
+#       textCache: the process-wide instance every WordBox renders through
+# Date: October 17th, 2026
+
+from collections import OrderedDict
+
+
+class TextSurfaceCache:
+    # font.render and font.size are the slow part of changing a WordBox's text or text color
+    # the same (font, text, color, antialias) always renders the same surface, so it is rendered once and shared
+    # shared surfaces must only be blitted, never drawn on
+    def __init__(self, maxEntries=4096):
+        self.maxEntries = maxEntries
+        self._entries = OrderedDict()  # key -> (surface, (width, height)), least recently used first
+        self.hits = 0
+        self.misses = 0
+        self._recorded = None  # keys asked for since startRecording(), None when not recording
+
+    def render(self, font, text, color, antialias=True):
+        # returns the rendered surface and the size font.size() gives for the text
+        key = (font, text, tuple(color), antialias)
+        if self._recorded is not None:
+            self._recorded[key] = None
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        entry = (font.render(text, antialias, color), font.size(text))
+        self._entries[key] = entry
+        if len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)  # least recently used
+        return entry
+
+    def add(self, font, text, color, surface, size, antialias=True):
+        # puts a surface rendered earlier, eg. read from a file, in the cache as if font.render had made it
+        key = (font, text, tuple(color), antialias)
+        self._entries[key] = (surface, tuple(size))
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)
+
+    def startRecording(self):
+        # from now on every text asked for is written down, rendered or not, until stopRecording()
+        self._recorded = dict()  # used as an ordered set
+
+    def stopRecording(self):
+        # returns the entries asked for while recording, as (font, text, color, antialias, surface, size)
+        # entries evicted since they were asked for are left out
+        recorded = []
+        for key in self._recorded or ():
+            entry = self._entries.get(key)
+            if entry is not None:
+                recorded.append(key + entry)
+        self._recorded = None
+        return recorded
+
+    def getStats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries),
+                "maxEntries": self.maxEntries}
+
+    def resetStats(self):
+        self.hits = 0
+        self.misses = 0
+
+    def resize(self, maxEntries):
+        self.maxEntries = maxEntries
+        while len(self._entries) > self.maxEntries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+textCache = TextSurfaceCache()